@@ -0,0 +1,90 @@
+"""Benchmarks for Actor attributes, drawing and collisions."""
+import pytest
+
+from pgzero.actor import Actor
+from pgzero.collision import SpatialHash
+from pgzero.screen import Screen
+
+
+@pytest.fixture
+def actors():
+    return [Actor('alien', pos=(i % 800, i % 600)) for i in range(10000)]
+
+
+def test_move_10k_actors(benchmark, actors):
+    def move():
+        for a in actors:
+            a.x += 1
+            a.y -= 1
+    benchmark(move)
+
+
+def test_set_pos_10k_actors(benchmark, actors):
+    def move():
+        for a in actors:
+            a.pos = (100, 100)
+    benchmark(move)
+
+
+def test_read_rect_attributes(benchmark):
+    a = Actor('alien')
+
+    def read():
+        return a.left, a.right, a.top, a.bottom, a.center
+    benchmark(read)
+
+
+def test_rotate_actor(benchmark):
+    a = Actor('alien')
+
+    def rotate():
+        a.angle += 1
+        a._build_transformed_surf()
+    benchmark(rotate)
+
+
+def test_draw_1k_actors(benchmark, display):
+    screen = Screen()
+    screen._set_surface(display)
+    actors = [Actor('alien', pos=(i % 800, i % 600)) for i in range(1000)]
+
+    def draw():
+        for a in actors:
+            screen.blit(a._build_transformed_surf(), a.topleft)
+    benchmark(draw)
+
+
+def test_draw_actors_1k_actors(benchmark, display):
+    screen = Screen()
+    screen._set_surface(display)
+    actors = [Actor('alien', pos=(i % 800, i % 600)) for i in range(1000)]
+    benchmark(screen.draw_actors, actors)
+
+
+def test_colliderect_pairwise_500_actors(benchmark):
+    actors = [Actor('alien', pos=(i * 37 % 800, i * 53 % 600))
+              for i in range(500)]
+
+    def collide():
+        return [
+            (a, b)
+            for i, a in enumerate(actors)
+            for b in actors[i + 1:]
+            if a.colliderect(b)
+        ]
+    benchmark(collide)
+
+
+def test_spatial_hash_all_pairs_500_actors(benchmark):
+    index = SpatialHash(cell_size=100)
+    for i in range(500):
+        index.add(Actor('alien', pos=(i * 37 % 800, i * 53 % 600)))
+    benchmark(lambda: list(index.all_pairs()))
+
+
+def test_collide_mask_rotated_actors(benchmark):
+    a = Actor('alien', pos=(100, 100))
+    b = Actor('alien', pos=(130, 120))
+    a.angle = 30
+    b.angle = 60
+    benchmark(a.collide_mask, b)
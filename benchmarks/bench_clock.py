@@ -0,0 +1,149 @@
+"""Benchmarks for the clock and animations."""
+import pytest
+
+from pgzero.animation import Animation, TWEEN_FUNCTIONS, get_tween_table
+from pgzero.clock import Clock, TimingWheelClock
+
+
+clocks = pytest.mark.parametrize(
+    'clock_class', [Clock, TimingWheelClock], ids=['heap', 'wheel']
+)
+
+
+class Target:
+    x = 0
+    y = 0
+
+
+def callback():
+    pass
+
+
+@clocks
+def test_schedule_1k(benchmark, clock_class):
+    def schedule():
+        clock = clock_class()
+        for i in range(1000):
+            clock.schedule(callback, i / 1000)
+    benchmark(schedule)
+
+
+@clocks
+def test_tick_1k_intervals(benchmark, clock_class):
+    clock = clock_class()
+    callbacks = [lambda: None for _ in range(1000)]
+    for i, cb in enumerate(callbacks):
+        clock.schedule_interval(cb, 0.001 * (i % 16 + 1))
+    benchmark(clock.tick, 1 / 60)
+
+
+@clocks
+def test_unschedule_1k(benchmark, clock_class):
+    callbacks = [lambda: None for _ in range(1000)]
+
+    def unschedule():
+        clock = clock_class()
+        for i, cb in enumerate(callbacks):
+            clock.schedule(cb, i)
+        for cb in callbacks:
+            clock.unschedule(cb)
+    benchmark(unschedule)
+
+
+@clocks
+def test_20k_short_timers(benchmark, clock_class):
+    """Simulate a second of 20,000 live bullets with short lifetimes."""
+    callbacks = [lambda: None for _ in range(20000)]
+
+    def run():
+        clock = clock_class()
+        for i, cb in enumerate(callbacks):
+            clock.schedule(cb, 0.5 + i % 97 / 100)
+        for frame in range(60):
+            clock.tick(1 / 60)
+            for cb in callbacks[frame::60]:
+                clock.schedule(cb, 0.5)
+    benchmark(run)
+
+
+@clocks
+def test_20k_timers_one_callback(benchmark, clock_class):
+    """Fire 20,000 timers sharing one callback, newest first."""
+    def run():
+        clock = clock_class()
+        for i in range(20000):
+            clock.schedule(callback, 1.5 - i / 20000)
+        for frame in range(100):
+            clock.tick(1 / 60)
+    benchmark(run)
+
+
+def test_update_1k_animations(benchmark):
+    targets = [Target() for _ in range(1000)]
+    anims = [
+        Animation(t, tween='accel_decel', duration=1e9, x=100, y=(i % 10))
+        for i, t in enumerate(targets)
+    ]
+
+    def update():
+        for a in anims:
+            a.update(1 / 60)
+    benchmark(update)
+    for a in anims:
+        a.stop()
+
+
+def test_tick_1k_batched_animations(benchmark):
+    targets = [Target() for _ in range(1000)]
+    anims = [
+        Animation(t, tween='accel_decel', duration=1e9, x=100, y=(i % 10))
+        for i, t in enumerate(targets)
+    ]
+    clock = Clock()
+    clock.each_tick(Animation._update_batches)
+    benchmark(clock.tick, 1 / 60)
+    for a in anims:
+        a.stop()
+
+
+@pytest.mark.parametrize('table', [False, True], ids=['exact', 'table'])
+def test_tween_functions(benchmark, table):
+    functions = [
+        TWEEN_FUNCTIONS[name]
+        for name in ('in_elastic', 'out_elastic', 'in_out_elastic',
+                     'bounce_start_end')
+    ]
+    if table:
+        functions = [get_tween_table(f) for f in functions]
+    ns = [i / 1000 for i in range(1001)]
+
+    def tween():
+        for f in functions:
+            for n in ns:
+                f(n)
+    benchmark(tween)
+
+
+@pytest.mark.parametrize('table', [False, True], ids=['exact', 'table'])
+def test_tick_1k_batched_elastic(benchmark, table):
+    targets = [Target() for _ in range(1000)]
+    anims = [
+        Animation(t, tween='in_out_elastic', duration=1e9, tween_table=table,
+                  x=100, y=(i % 10))
+        for i, t in enumerate(targets)
+    ]
+    clock = Clock()
+    clock.each_tick(Animation._update_batches)
+    benchmark(clock.tick, 1 / 60)
+    for a in anims:
+        a.stop()
+
+
+def test_start_stop_1k_animations(benchmark):
+    targets = [Target() for _ in range(1000)]
+
+    def start_stop():
+        anims = [Animation(t, duration=1, x=100) for t in targets]
+        for a in anims:
+            a.stop()
+    benchmark(start_stop)
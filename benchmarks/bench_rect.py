@@ -0,0 +1,50 @@
+"""Benchmarks for ZRect operations."""
+from pgzero.rect import ZRect, RectArray
+
+
+def test_construct(benchmark):
+    benchmark(ZRect, 10.5, 20.5, 30, 40)
+
+
+def test_construct_from_rect(benchmark):
+    r = ZRect(10.5, 20.5, 30, 40)
+    benchmark(ZRect, r)
+
+
+def test_colliderect(benchmark):
+    a = ZRect(0, 0, 10, 10)
+    b = ZRect(5, 5, 10, 10)
+    benchmark(a.colliderect, b)
+
+
+def test_move_ip(benchmark):
+    r = ZRect(0, 0, 10, 10)
+    benchmark(r.move_ip, 1, 1)
+
+
+def test_clip(benchmark):
+    a = ZRect(0, 0, 10, 10)
+    b = ZRect(5, 5, 10, 10)
+    benchmark(a.clip, b)
+
+
+def test_collidelist_1k(benchmark):
+    r = ZRect(500, 500, 10, 10)
+    others = [ZRect(i, i % 37, 8, 8) for i in range(1000)]
+    benchmark(r.collidelist, others)
+
+
+def test_rect_array_colliderect_1k(benchmark):
+    r = ZRect(500, 500, 10, 10)
+    others = RectArray([ZRect(i, i % 37, 8, 8) for i in range(1000)])
+    benchmark(others.collidelistall, r)
+
+
+def test_rect_array_collide_pairs_1k(benchmark):
+    bullets = RectArray(
+        [ZRect(i * 7 % 800, i * 13 % 600, 4, 4) for i in range(1000)]
+    )
+    enemies = RectArray(
+        [ZRect(i * 31 % 800, i * 17 % 600, 32, 32) for i in range(1000)]
+    )
+    benchmark(bullets.collide_pairs, enemies)
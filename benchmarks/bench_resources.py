@@ -0,0 +1,74 @@
+"""Benchmarks for text rendering and resource loading."""
+from pgzero import ptext
+from pgzero.loaders import images, sounds, ImageLoader
+
+
+def test_getsurf_cached(benchmark):
+    benchmark(
+        ptext.getsurf, 'Score: 1000', fontname='eunomia_regular', fontsize=24
+    )
+
+
+def test_getsurf_hud_uncached(benchmark):
+    counter = iter(range(10 ** 9))
+
+    def hud():
+        n = next(counter)
+        for line in range(10):
+            ptext.getsurf(
+                f'Score {n} line {line}',
+                fontname='eunomia_regular',
+                fontsize=24,
+                owidth=1,
+                ocolor='black',
+                cache=False,
+            )
+    benchmark(hud)
+
+
+def test_load_image_cached(benchmark):
+    images.load('alien')
+    benchmark(images.load, 'alien')
+
+
+def test_load_image_disk_cached(benchmark, tmp_path):
+    loader = ImageLoader('images')
+    loader.enable_disk_cache(str(tmp_path))
+    loader.load('alien')
+
+    def load():
+        loader.unload('alien')
+        return loader.load('alien')
+    benchmark(load)
+
+
+def test_find_image(benchmark):
+    benchmark(images._find, 'alien')
+
+
+def test_load_image_uncached(benchmark):
+    def load():
+        images.unload('alien')
+        return images.load('alien')
+    benchmark(load)
+
+
+SOUNDS = [
+    'powerup', 'vorbis1', 'vorbis2', 'wav22k16bitpcm', 'wav22k8bitpcm',
+    'wav22kadpcm', 'wav8k16bitpcm', 'wav8k8bitpcm', 'wav8kadpcm',
+]
+
+
+def test_load_sounds(benchmark):
+    def load():
+        sounds.unload_all()
+        for name in SOUNDS:
+            sounds.load(name)
+    benchmark(load)
+
+
+def test_preload_sounds(benchmark):
+    def preload():
+        sounds.unload_all()
+        sounds.preload(SOUNDS).wait()
+    benchmark(preload)
@@ -0,0 +1,34 @@
+"""Configuration for the Pygame Zero benchmark suite.
+
+The benchmarks use pytest-benchmark. Run them with::
+
+    pytest benchmarks --benchmark-json=results.json
+
+and compare against a previous run with ``--benchmark-compare``.
+
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from pgzero.loaders import set_root  # noqa: E402
+
+
+# Load images and fonts from the test suite's resources
+RESOURCES = Path(__file__).parent.parent / 'test'
+
+
+@pytest.fixture(scope='session', autouse=True)
+def display():
+    """Create a display, which is needed to load images."""
+    pygame.init()
+    surf = pygame.display.set_mode((800, 600))
+    set_root(str(RESOURCES))
+    yield surf
+    pygame.display.quit()
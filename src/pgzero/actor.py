@@ -1,10 +1,14 @@
 import pygame
+import weakref
+from collections import OrderedDict
 from math import radians, sin, cos, atan2, degrees, sqrt
+from operator import attrgetter
 
 from . import game
 from . import loaders
 from . import rect
 from . import spellcheck
+from .screen import screen_instance
 
 
 ANCHORS = {
@@ -73,15 +77,137 @@ def transform_anchor(ax, ay, w, h, angle):
     )
 
 
+class SurfaceCache:
+    """A memory-bounded LRU cache of transformed Actor surfaces.
+
+    Actors with the same image, angle and opacity share one transformed
+    surface from this cache rather than each transforming their own copy.
+
+    If angle_step is set, angles are rounded to a multiple of it before
+    rotating, so that Actors at similar angles can share surfaces too.
+
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, angle_step=None):
+        self.max_bytes = max_bytes
+        self.angle_step = angle_step
+        self.bytes = 0
+        self._surfs = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfs)
+
+    def quantise(self, angle):
+        """Round angle to the configured angle_step."""
+        step = self.angle_step
+        if not step:
+            return angle
+        return round(angle / step) * step
+
+    def get(self, key, orig):
+        """Get the surface cached for key, if it was built from orig."""
+        try:
+            src, surf, size = self._surfs[key]
+        except KeyError:
+            return None
+        if src() is not orig:
+            # The image was reloaded; this entry is stale
+            self._discard(key)
+            return None
+        self._surfs.move_to_end(key)
+        return surf
+
+    def put(self, key, orig, surf):
+        """Cache surf, built from the surface orig, under key."""
+        w, h = surf.get_size()
+        size = surf.get_bytesize() * w * h
+        if size > self.max_bytes:
+            return
+        self._discard(key)
+
+        def forget(ref):
+            # orig was freed, so nothing can use this entry
+            entry = self._surfs.get(key)
+            if entry is not None and entry[0] is ref:
+                self._discard(key)
+
+        # orig is held weakly, so that the cache doesn't keep it loaded
+        self._surfs[key] = weakref.ref(orig, forget), surf, size
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._discard(next(iter(self._surfs)))
+
+    def _discard(self, key):
+        entry = self._surfs.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def clear(self):
+        """Remove all surfaces from the cache."""
+        self._surfs.clear()
+        self.bytes = 0
+
+
+# The cache shared by all Actors
+surface_cache = SurfaceCache()
+
+# Collision masks of transformed Actor surfaces. The keys are weak, so a mask
+# is dropped along with its surface, whether that belongs to one Actor or is
+# shared through the surface_cache.
+_masks = weakref.WeakKeyDictionary()
+
+# Pixels more opaque than this (out of MAX_ALPHA) are solid in collision masks
+MASK_THRESHOLD = 127
+
+
+def _get_alpha(actor):
+    return int(actor.opacity * MAX_ALPHA + 0.5)  # +0.5 for rounding up.
+
+
+# Pre-rotated frames of images, as {steps: frames} keyed weakly by the image
+# surface, so that the frames are released along with the image. The frames
+# stored leave out the unrotated image itself, which would keep it alive.
+_rotation_frames = weakref.WeakKeyDictionary()
+
+
+def rotation_frames(image, steps):
+    """Get a list of `steps` rotated copies of the named image.
+
+    Frame i is the image rotated anticlockwise by i * 360 / steps degrees.
+    Frames are built on first use and shared by all Actors.
+
+    """
+    if not isinstance(steps, int) or steps < 1:
+        raise ValueError(
+            "rotation_steps must be a positive integer (not %r)" % (steps,)
+        )
+    orig = loaders.images.load(image)
+    by_steps = _rotation_frames.get(orig)
+    if by_steps is None:
+        by_steps = _rotation_frames[orig] = {}
+    rotated = by_steps.get(steps)
+    if rotated is None:
+        step = 360 / steps
+        rotated = by_steps[steps] = [
+            pygame.transform.rotate(orig, i * step) for i in range(1, steps)
+        ]
+    return [orig] + rotated
+
+
 def _set_angle(actor, current_surface):
-    if actor._angle % 360 == 0:
+    angle = actor._render_angle()
+    if angle % 360 == 0:
         # No changes required for default angle.
         return current_surface
-    return pygame.transform.rotate(current_surface, actor._angle)
+    steps = actor._rotation_steps
+    if steps and current_surface is actor._orig_surf:
+        frame = round(angle * steps / 360) % steps
+        return actor._rotation_frames[frame]
+    return pygame.transform.rotate(current_surface, angle)
 
 
 def _set_opacity(actor, current_surface):
-    alpha = int(actor.opacity * MAX_ALPHA + 0.5)  # +0.5 for rounding up.
+    alpha = _get_alpha(actor)
 
     if alpha == MAX_ALPHA:
         # No changes required for fully opaque surfaces (corresponds to the
@@ -98,34 +224,86 @@ def _set_opacity(actor, current_surface):
     return alpha_img
 
 
+ROTATION_FRAMES_FUNCTION_ORDER = [_set_angle, _set_opacity]
+
+
 class Actor:
     EXPECTED_INIT_KWARGS = SYMBOLIC_POSITIONS
     DELEGATED_ATTRIBUTES = [
-        a for a in dir(rect.ZRect) if not a.startswith("_")
+        a for a in dir(rect.ZRect)
+        if not a.startswith("_") and a not in rect.ZRect.__slots__
+        and a != 'rect'
     ]
 
     function_order = [_set_opacity, _set_angle]
     _anchor = _anchor_value = (0, 0)
     _angle = 0.0
     _opacity = 1.0
+    _rotation_steps = None
+
+    # Spatial indexes (see pgzero.collision) that must be told when we move
+    _spatial_indexes = ()
 
     def _build_transformed_surf(self):
-        cache_len = len(self._surface_cache)
+        cache = self._surface_cache
+        order = self.function_order
+        cache_len = len(cache)
+        if cache_len == len(order):
+            return cache[-1]
+
+        # Try the surface cache shared between Actors
+        key = self._shared_cache_key()
+        if key is not None:
+            surf = surface_cache.get(key, self._orig_surf)
+            if surf is not None:
+                # Intermediate surfaces are not known; these will be rebuilt
+                # from the original if needed.
+                cache[:] = [None] * (len(order) - 1) + [surf]
+                return surf
+
+        while cache and cache[-1] is None:
+            cache.pop()
+        cache_len = len(cache)
         if cache_len == 0:
             last = self._orig_surf
         else:
-            last = self._surface_cache[-1]
-        for f in self.function_order[cache_len:]:
+            last = cache[-1]
+        for f in order[cache_len:]:
             new_surf = f(self, last)
-            self._surface_cache.append(new_surf)
+            cache.append(new_surf)
             last = new_surf
-        return self._surface_cache[-1]
 
-    def __init__(self, image, pos=POS_TOPLEFT, anchor=ANCHOR_CENTER, **kwargs):
+        if key is not None:
+            surface_cache.put(key, self._orig_surf, last)
+        return last
+
+    def _shared_cache_key(self):
+        """Get the key for this Actor's surface in the shared surface_cache.
+
+        Return None if the Actor's surface should not be shared.
+
+        """
+        if self.function_order not in SHAREABLE_FUNCTION_ORDERS:
+            # Subclasses may apply transformations we don't know about
+            return None
+        angle = self._render_angle() % 360
+        alpha = _get_alpha(self)
+        if angle == 0 and alpha == MAX_ALPHA:
+            # The original surface is drawn as-is
+            return None
+        return self._image_name, angle, alpha
+
+    def __init__(self, image, pos=POS_TOPLEFT, anchor=ANCHOR_CENTER,
+                 rotation_steps=None, **kwargs):
         self._handle_unexpected_kwargs(kwargs)
 
         self._surface_cache = []
-        self.__dict__["_rect"] = rect.ZRect((0, 0), (0, 0))
+        if rotation_steps is not None:
+            self._rotation_steps = rotation_steps
+            # Rotate the pre-rotated frames before changing opacity, so the
+            # frames can be used as they are
+            self.function_order = ROTATION_FRAMES_FUNCTION_ORDER
+        self._rect = rect.ZRect((0, 0), (0, 0))
         # Initialise it at (0, 0) for size (0, 0).
         # We'll move it to the right place and resize it later
 
@@ -133,19 +311,13 @@ class Actor:
         self._init_position(pos, anchor, **kwargs)
 
     def __getattr__(self, attr):
+        # Rect attributes are delegated by properties (see _delegate_to_rect)
+        # so this is only reached for missing attributes
         if attr in self.__class__.DELEGATED_ATTRIBUTES:
             return getattr(self._rect, attr)
         else:
             return object.__getattribute__(self, attr)
 
-    def __setattr__(self, attr, value):
-        """Assign rect attributes to the underlying rect."""
-        if attr in self.__class__.DELEGATED_ATTRIBUTES:
-            return setattr(self._rect, attr, value)
-        else:
-            # Ensure data descriptors are set normally
-            return object.__setattr__(self, attr, value)
-
     def __iter__(self):
         return iter(self._rect)
 
@@ -235,10 +407,24 @@ class Actor:
         ax = calculate_anchor(ax, 'x', ow)
         ay = calculate_anchor(ay, 'y', oh)
         self._untransformed_anchor = ax, ay
-        if self._angle == 0.0:
+        angle = self._render_angle()
+        if angle == 0.0:
             self._anchor = self._untransformed_anchor
         else:
-            self._anchor = transform_anchor(ax, ay, ow, oh, self._angle)
+            self._anchor = transform_anchor(ax, ay, ow, oh, angle)
+
+    def _render_angle(self):
+        """Get the angle at which the Actor's image will be drawn.
+
+        This is the actual angle, rounded to the nearest of the Actor's
+        rotation steps, or to the shared surface_cache's angle_step.
+
+        """
+        steps = self._rotation_steps
+        if steps:
+            step = 360 / steps
+            return round(self._angle / step) * step
+        return surface_cache.quantise(self._angle)
 
     @property
     def angle(self):
@@ -249,6 +435,7 @@ class Actor:
         self._angle = angle
         w, h = self._orig_surf.get_size()
 
+        angle = self._render_angle()
         ra = radians(angle)
         sin_a = sin(ra)
         cos_a = cos(ra)
@@ -324,8 +511,17 @@ class Actor:
 
     @image.setter
     def image(self, image):
+        # Tell the loader which images are used, so that it doesn't unload
+        # them to stay within its max_bytes
+        self._orig_surf = loaders.images._use(image, self)
+        old = self.__dict__.get('_image_name')
+        if old is not None and old != image:
+            loaders.images._release(old, self)
         self._image_name = image
-        self._orig_surf = loaders.images.load(image)
+        if self._rotation_steps is not None:
+            self._rotation_frames = rotation_frames(
+                image, self._rotation_steps
+            )
         self._surface_cache.clear()  # Clear out old image's cache.
         self._update_pos()
 
@@ -337,7 +533,7 @@ class Actor:
 
     def draw(self):
         s = self._build_transformed_surf()
-        game.screen.blit(s, self.topleft)
+        screen_instance._mark_dirty(game.screen.blit(s, self.topleft))
 
     def angle_to(self, target):
         """Return the angle from this actors position to target, in degrees."""
@@ -361,5 +557,77 @@ class Actor:
         dy = ty - myy
         return sqrt(dx * dx + dy * dy)
 
+    def _get_mask(self):
+        """Get the collision mask of the Actor's image as it is drawn."""
+        surf = self._build_transformed_surf()
+        mask = _masks.get(surf)
+        if mask is None:
+            # Scale the threshold so that opacity doesn't change the shape
+            threshold = MASK_THRESHOLD * _get_alpha(self) // MAX_ALPHA
+            mask = _masks[surf] = pygame.mask.from_surface(surf, threshold)
+        return mask
+
+    def collide_mask(self, other):
+        """Test whether the visible pixels of this Actor overlap another's.
+
+        Return the position of a point of overlap, or None if there is none.
+
+        """
+        r = self._rect
+        o = other._rect
+        if not r.colliderect(o):
+            return None
+        offset = round(o.x - r.x), round(o.y - r.y)
+        point = self._get_mask().overlap(other._get_mask(), offset)
+        if point is None:
+            return None
+        return r.x + point[0], r.y + point[1]
+
+    def collidepoint_pixel(self, *pos):
+        """Test whether a point lies on a visible pixel of the Actor."""
+        x, y = pos[0] if len(pos) == 1 else pos
+        r = self._rect
+        if not r.collidepoint(x, y):
+            return False
+        mask = self._get_mask()
+        mx = int(x - r.x)
+        my = int(y - r.y)
+        w, h = mask.get_size()
+        return 0 <= mx < w and 0 <= my < h and bool(mask.get_at((mx, my)))
+
     def unload_image(self):
         loaders.images.unload(self._image_name)
+
+
+def _delegate_to_rect(name):
+    """Make a property that delegates an attribute of an Actor to its rect.
+
+    Setting a rect attribute moves the Actor, so spatial indexes are told.
+
+    """
+    zattr = getattr(rect.ZRect, name)
+    fget = attrgetter('_rect.' + name)
+    if not isinstance(zattr, property):
+        # A method, which can't be assigned
+        return property(fget, doc=zattr.__doc__)
+
+    zset = zattr.fset
+
+    def fset(self, value):
+        zset(self._rect, value)
+        for index in self._spatial_indexes:
+            index.update(self)
+    return property(fget, fset, doc=zattr.__doc__)
+
+
+for _name in Actor.DELEGATED_ATTRIBUTES:
+    if _name not in Actor.__dict__:
+        setattr(Actor, _name, _delegate_to_rect(_name))
+del _name
+
+
+# Function orders for which transformed surfaces can go in the surface_cache
+SHAREABLE_FUNCTION_ORDERS = (
+    Actor.function_order,
+    ROTATION_FRAMES_FUNCTION_ORDER,
+)
@@ -2,19 +2,92 @@
 #  http://www.clutter-project.org/docs/clutter/stable/ClutterAlpha.html
 
 
+import traceback
 from math import sin, pow, pi
+from operator import itemgetter
 
-from .clock import each_tick, unschedule
+import numpy as np
+
+from .clock import each_tick
 from .spellcheck import suggest
 
 TWEEN_FUNCTIONS = {}
 
+# Versions of the tween functions that operate on numpy arrays, keyed by the
+# scalar function
+VECTOR_TWEEN_FUNCTIONS = {}
+
 
 def tweener(f):
     TWEEN_FUNCTIONS[f.__name__] = f
     return f
 
 
+def vectorised(scalar):
+    """Register a numpy version of the given tween function."""
+    def register(f):
+        VECTOR_TWEEN_FUNCTIONS[scalar] = f
+        return f
+    return register
+
+
+# The number of intervals in the tables used to approximate tween functions
+TWEEN_TABLE_SIZE = 1024
+
+# Tables approximating tween functions, keyed by the exact function
+TWEEN_TABLES = {}
+
+
+def make_tween_table(function, size=TWEEN_TABLE_SIZE):
+    """Approximate a tween function with a table of samples.
+
+    Return a tween function that linearly interpolates between the samples.
+    This is faster than the elastic and bounce tweens, particularly when
+    animations are updated in batches, at the cost of a small error. With
+    the default size, this is under 2e-3 for the bounce tweens, whose sharp
+    corners fall between samples, and under 5e-4 for the elastic tweens
+    (out_elastic jumps to exactly 1 at the end, so its error doesn't shrink
+    with a larger table).
+
+    """
+    xs = np.linspace(0.0, 1.0, size + 1)
+    values = [function(x) for x in xs.tolist()]
+    ys = np.array(values, dtype=float)
+    last = values[-1]
+
+    def lookup(n):
+        x = n * size
+        i = int(x)
+        if i >= size:
+            return last
+        a = values[i]
+        return a + (values[i + 1] - a) * (x - i)
+
+    lookup.__name__ = function.__name__
+    VECTOR_TWEEN_FUNCTIONS[lookup] = lambda n: np.interp(n, xs, ys)
+    return lookup
+
+
+def get_tween_table(function):
+    """Get a table approximating the given tween function.
+
+    Tables are built the first time they are needed.
+
+    """
+    table = TWEEN_TABLES.get(function)
+    if table is None:
+        table = TWEEN_TABLES[function] = make_tween_table(function)
+    return table
+
+
+def vector_tween_function(function):
+    """Get a version of a tween function that operates on numpy arrays."""
+    try:
+        return VECTOR_TWEEN_FUNCTIONS[function]
+    except KeyError:
+        return lambda n: np.fromiter(map(function, n.tolist()), float, len(n))
+
+
 @tweener
 def linear(n):
     return n
@@ -112,6 +185,92 @@ def bounce_start_end(n):
     return _out_bounce_internal(p - 1., 1.) * .5 + .5
 
 
+@vectorised(linear)
+def _vector_linear(n):
+    return n
+
+
+@vectorised(accelerate)
+def _vector_accelerate(n):
+    return n * n
+
+
+@vectorised(decelerate)
+def _vector_decelerate(n):
+    return -1.0 * n * (n - 2.0)
+
+
+@vectorised(accel_decel)
+def _vector_accel_decel(n):
+    p = n * 2
+    q = p - 1.0
+    return np.where(p < 1, 0.5 * p * p, -0.5 * (q * (q - 2.0) - 1.0))
+
+
+@vectorised(in_elastic)
+def _vector_in_elastic(n):
+    p = .3
+    s = p / 4.0
+    q = n - 1.0
+    v = -(np.power(2.0, 10 * q) * np.sin((q - s) * (2 * pi) / p))
+    return np.where(n == 1, 1.0, v)
+
+
+@vectorised(out_elastic)
+def _vector_out_elastic(n):
+    p = .3
+    s = p / 4.0
+    v = np.power(2.0, -10 * n) * np.sin((n - s) * (2 * pi) / p) + 1.0
+    return np.where(n == 1, 1.0, v)
+
+
+@vectorised(in_out_elastic)
+def _vector_in_out_elastic(n):
+    p = .3 * 1.5
+    s = p / 4.0
+    q = n * 2
+    r = q - 1.0
+    wave = np.sin((r - s) * (2.0 * pi) / p)
+    v = np.where(
+        q < 1,
+        -.5 * (np.power(2.0, 10 * r) * wave),
+        np.power(2.0, -10 * r) * wave * .5 + 1.0,
+    )
+    return np.where(q == 2, 1.0, v)
+
+
+def _vector_out_bounce(p):
+    return np.select(
+        [p < (1.0 / 2.75), p < (2.0 / 2.75), p < (2.5 / 2.75)],
+        [
+            7.5625 * p * p,
+            7.5625 * (p - 1.5 / 2.75) ** 2 + .75,
+            7.5625 * (p - 2.25 / 2.75) ** 2 + .9375,
+        ],
+        7.5625 * (p - 2.625 / 2.75) ** 2 + .984375,
+    )
+
+
+@vectorised(bounce_end)
+def _vector_bounce_end(n):
+    return _vector_out_bounce(n)
+
+
+@vectorised(bounce_start)
+def _vector_bounce_start(n):
+    return 1.0 - _vector_out_bounce(1.0 - n)
+
+
+@vectorised(bounce_start_end)
+def _vector_bounce_start_end(n):
+    p = n * 2.
+    return np.where(
+        p < 1.,
+        (1.0 - _vector_out_bounce(1.0 - p)) * .5,
+        _vector_out_bounce(p - 1.) * .5 + .5,
+    )
+
+
 def tween(n, start, end):
     return start + (end - start) * n
 
@@ -125,6 +284,171 @@ def tween_attr(n, start, end):
         return tween(n, start, end)
 
 
+def batch_channels(start, end):
+    """Split the start and end values of an attribute into numbers.
+
+    Return a tuple (kind, starts, deltas), where kind is the type to rebuild
+    the value as (or None for a plain number), or None if the values can't
+    be tweened as arrays of numbers.
+
+    """
+    if type(start) in (int, float) and type(end) in (int, float):
+        return None, [start], [end - start]
+    if isinstance(start, (tuple, list)) and isinstance(end, (tuple, list)):
+        if len(start) != len(end):
+            return None
+        for v in (*start, *end):
+            if type(v) not in (int, float):
+                return None
+        # Rebuild as a plain tuple or list, as tween_attr() does; subclasses
+        # such as namedtuples can't necessarily be built from a list
+        kind = tuple if isinstance(start, tuple) else list
+        return kind, list(start), [b - a for a, b in zip(start, end)]
+    return None
+
+
+def tween_function(tween, tween_table=False):
+    """Look up a tween function by name.
+
+    :param tween_table: If True, get a table approximating the function.
+
+    """
+    try:
+        function = TWEEN_FUNCTIONS[tween]
+    except KeyError:
+        suggested_tween = suggest(tween, TWEEN_FUNCTIONS.keys())
+        if len(suggested_tween) > 0:
+            raise KeyError(
+                'No tween called %s found, did you mean %s?'
+                % (tween, suggested_tween[0])
+            )
+        else:
+            raise KeyError('No tween called %s found.' % tween)
+    if tween_table:
+        function = get_tween_table(function)
+    return function
+
+
+class TweenBatch:
+    """All running animations that use the same tween function.
+
+    Rather than updating each Animation separately, the progress of all of
+    the animations in a batch is computed with numpy, and the tweened values
+    are written back to the animated objects.
+
+    Animations join and leave the batch in between updates.
+
+    """
+
+    def __init__(self, function):
+        self.function = vector_tween_function(function)
+        self._reset()
+
+    def _reset(self):
+        self.animations = []
+        self.pending = []
+        self.live = 0
+        self.dirty = False
+        self.elapsed = np.zeros(0)
+        self.duration = np.zeros(0)
+        self.starts = self.deltas = np.zeros(0)
+        self.owners = np.zeros(0, dtype=np.intp)
+        self.writes = []
+
+    def __len__(self):
+        return self.live
+
+    def add(self, anim, channels):
+        """Add an animation, which will tween the given channels.
+
+        :param channels: A list of (attr, kind, starts, deltas) tuples.
+
+        """
+        anim._channels = channels
+        anim._batch_index = None
+        self.pending.append(anim)
+        self.live += 1
+        self.dirty = True
+
+    def remove(self, anim):
+        """Remove an animation from the batch."""
+        if anim._batch_index is None:
+            self.pending.remove(anim)
+        else:
+            self.animations[anim._batch_index] = None
+        self.live -= 1
+        if not self.live:
+            # Release references to the animated objects straight away
+            self._reset()
+        else:
+            self.dirty = True
+
+    def _rebuild(self):
+        keep = [i for i, a in enumerate(self.animations) if a is not None]
+        anims = [self.animations[i] for i in keep] + self.pending
+        self.elapsed = np.concatenate(
+            [self.elapsed[keep], np.zeros(len(self.pending))]
+        )
+        self.duration = np.array([a.duration for a in anims], dtype=float)
+
+        starts = []
+        deltas = []
+        owners = []
+        writes = []
+        for i, anim in enumerate(anims):
+            anim._batch_index = i
+            for attr, kind, start, delta in anim._channels:
+                first = len(starts)
+                starts.extend(start)
+                deltas.extend(delta)
+                owners.extend([i] * len(start))
+                writes.append((
+                    anim, anim.object, attr, anim.targets, kind,
+                    first, len(starts)
+                ))
+        self.animations = anims
+        self.pending = []
+        self.starts = np.array(starts, dtype=float)
+        self.deltas = np.array(deltas, dtype=float)
+        self.owners = np.array(owners, dtype=np.intp)
+        self.writes = writes
+        self.dirty = False
+
+    def update(self, dt):
+        """Advance all animations in the batch by dt seconds."""
+        if self.dirty:
+            self._rebuild()
+        self.elapsed += dt
+        n = self.elapsed / self.duration
+        eased = self.function(np.minimum(n, 1.0))
+        values = (self.starts + self.deltas * eased[self.owners]).tolist()
+
+        failed = []
+        for anim, obj, attr, targets, kind, i, j in self.writes:
+            if attr not in targets:
+                # Taken over by another animation
+                continue
+            try:
+                if kind is None:
+                    setattr(obj, attr, values[i])
+                else:
+                    setattr(obj, attr, kind(values[i:j]))
+            except Exception:
+                # Stop just this animation, as the clock would if it were
+                # updated by its own callback
+                traceback.print_exc()
+                failed.append(anim)
+        for anim in failed:
+            anim.stop()
+
+        finished = np.flatnonzero(n > 1)
+        if len(finished):
+            anims = self.animations
+            for anim in [anims[i] for i in finished]:
+                if anim is not None and anim.running:
+                    anim._finish()
+
+
 class Animation:
     """An animation manager for object attribute animations.
 
@@ -136,11 +460,23 @@ class Animation:
     be tweened.
 
     The update() method is automatically scheduled with the clock for
-    the duration of the animation.
+    the duration of the animation. Animations of numbers, or of tuples or
+    lists of numbers, are instead updated in a TweenBatch along with all
+    other animations that use the same tween function.
 
     """
     animations = []  # Stores strong references to objects being animated.
 
+    # If True, approximate tween functions with tables. This can be set
+    # for all animations here, or for one animation with the tween_table
+    # argument.
+    tween_table = False
+
+    # TweenBatches keyed by tween function, which are all updated by a single
+    # clock callback while any of them contains animations.
+    _batches = {}
+    _batch_tick = None
+
     # Animations are stored in _animation_dict under (object id, target
     # attribute) keys. Objects may not be hashable, so the id, rather than
     # the object itself, is needed.
@@ -152,19 +488,11 @@ class Animation:
     _animation_dict = {}
 
     def __init__(self, object, tween='linear', duration=1, on_finished=None,
-                 **targets):
+                 tween_table=None, **targets):
         self.targets = targets
-        try:
-            self.function = TWEEN_FUNCTIONS[tween]
-        except KeyError:
-            suggested_tween = suggest(tween, TWEEN_FUNCTIONS.keys())
-            if len(suggested_tween) > 0:
-                raise KeyError(
-                    'No tween called %s found, did you mean %s?'
-                    % (tween, suggested_tween[0])
-                )
-            else:
-                raise KeyError('No tween called %s found.' % tween)
+        if tween_table is not None:
+            self.tween_table = tween_table
+        self.function = tween_function(tween, self.tween_table)
         self.duration = duration
         self.on_finished = on_finished
         self.t = 0
@@ -184,9 +512,50 @@ class Animation:
             if previous_animation is not None:
                 previous_animation._remove_target(k)
             self._animation_dict[key] = self
-        each_tick(self.update)
+
+        channels = self._batch_channels()
+        if channels is None:
+            self._batch = None
+            self._tick = each_tick(self.update)
+        else:
+            self._batch = self._batches.get(self.function)
+            if self._batch is None:
+                self._batch = self._batches[self.function] = \
+                    TweenBatch(self.function)
+            self._batch.add(self, channels)
+            tick = Animation._batch_tick
+            if tick is None or not tick.active:
+                Animation._batch_tick = each_tick(Animation._update_batches)
         self.animations.append(self)
 
+    def _batch_channels(self):
+        """Get the channels to tween in a batch, or None if we can't."""
+        if not self.duration > 0:
+            return None
+        channels = []
+        for k, end in self.targets.items():
+            split = batch_channels(self.initial[k], end)
+            if split is None:
+                return None
+            channels.append((k, *split))
+        return channels
+
+    @classmethod
+    def _update_batches(cls, dt):
+        for batch in list(cls._batches.values()):
+            if batch:
+                try:
+                    batch.update(dt)
+                except Exception:
+                    # Don't let one batch stop the others being updated
+                    traceback.print_exc()
+                    for anim in batch.animations + batch.pending:
+                        if anim is not None:
+                            anim.stop()
+        if not any(cls._batches.values()) and cls._batch_tick:
+            cls._batch_tick.cancel()
+            cls._batch_tick = None
+
     @property
     def running(self):
         """Running state of the animation.
@@ -200,16 +569,18 @@ class Animation:
         self.t += dt
         n = self.t / self.duration
         if n > 1:
-            n = 1
-            self.stop(complete=True)
-            if self.on_finished is not None:
-                self.on_finished()
+            self._finish()
             return
         n = self.function(n)
         for k in self.targets:
             v = tween_attr(n, self.initial[k], self.targets[k])
             setattr(self.object, k, v)
 
+    def _finish(self):
+        self.stop(complete=True)
+        if self.on_finished is not None:
+            self.on_finished()
+
     def stop(self, complete=False):
         """Stop the animation, optionally completing the transition to the final
         property values.
@@ -229,7 +600,10 @@ class Animation:
                 setattr(self.object, k, self.targets[k])
         for k in list(self.targets):
             self._remove_target(k, stop=False)
-        unschedule(self.update)
+        if self._batch is None:
+            self._tick.cancel()
+        else:
+            self._batch.remove(self)
         self.animations.remove(self)
 
     def _remove_target(self, target, stop=True):
@@ -239,6 +613,233 @@ class Animation:
             self.stop()
 
 
-def animate(object, tween='linear', duration=1, on_finished=None, **targets):
+def animate(object, tween='linear', duration=1, on_finished=None,
+            tween_table=None, **targets):
     return Animation(object, tween, duration, on_finished=on_finished,
-                     **targets)
+                     tween_table=tween_table, **targets)
+
+
+class Step:
+    """Animation of some attributes of an object, as part of a Timeline.
+
+    Unlike an Animation, a Step does nothing until it is added to a sequence
+    or parallel group.
+
+    """
+
+    def __init__(self, object, tween='linear', duration=1, tween_table=None,
+                 **targets):
+        if tween_table is None:
+            tween_table = Animation.tween_table
+        self.object = object
+        self.function = tween_function(tween, tween_table)
+        self.duration = duration
+        self.targets = targets
+
+    def segments(self):
+        return [
+            (0, self.duration, self.object, k, self.function, v)
+            for k, v in self.targets.items()
+        ]
+
+
+class Timeline:
+    """Animation steps and function calls, run by a single clock callback.
+
+    The steps are flattened into segments, each of which is a tuple
+    (start, end, object, attribute, tween function, target value). A segment
+    with an attribute of None calls the target at its start time instead.
+    The start value of each segment is read from the object when the segment
+    starts.
+
+    Timelines are created with animate.sequence(), animate.parallel() and
+    animate.keyframes(), and start running straight away.
+
+    """
+    timelines = []  # Stores strong references to running timelines.
+
+    def __init__(self, segments, duration, on_finished=None):
+        self.segments = sorted(segments, key=itemgetter(0))
+        self.duration = duration
+        self.on_finished = on_finished
+        self.t = 0
+        self._next = 0  # index of the next segment to start
+        self._active = []  # indexes of the segments in progress
+        self._initial = [None] * len(self.segments)
+        self._running = True
+        self._tick = each_tick(self.update)
+        self.timelines.append(self)
+
+    @property
+    def running(self):
+        """True until the timeline has finished or been stopped."""
+        return self._running
+
+    def _absorb(self, offset):
+        """Stop running separately, to be included in another timeline.
+
+        Return the segments, moved to start at offset.
+
+        """
+        if self.t or not self._running:
+            raise ValueError('Timeline has already started')
+        self._running = False
+        self._tick.cancel()
+        self.timelines.remove(self)
+        segments = [
+            (start + offset, end + offset, *rest)
+            for start, end, *rest in self.segments
+        ]
+        if self.on_finished is not None:
+            end = offset + self.duration
+            segments.append((end, end, None, None, None, self.on_finished))
+        return segments
+
+    def _advance(self, i, t):
+        """Update segment i to time t. Return False if it is finished."""
+        start, end, obj, attr, function, target = self.segments[i]
+        if t >= end:
+            setattr(obj, attr, target)
+            return False
+        n = function((t - start) / (end - start))
+        setattr(obj, attr, tween_attr(n, self._initial[i], target))
+        return True
+
+    def update(self, dt):
+        self.t += dt
+        t = self.t
+        if self._active:
+            self._active = [i for i in self._active if self._advance(i, t)]
+
+        segments = self.segments
+        while self._next < len(segments) and segments[self._next][0] <= t:
+            i = self._next
+            self._next += 1
+            start, end, obj, attr, function, target = segments[i]
+            if attr is None:
+                target()
+                if not self._running:
+                    return
+                continue
+            self._initial[i] = getattr(obj, attr)
+            if self._advance(i, t):
+                self._active.append(i)
+
+        if not self._active and self._next == len(segments) \
+                and t >= self.duration:
+            self.stop()
+            if self.on_finished is not None:
+                self.on_finished()
+
+    def stop(self, complete=False):
+        """Stop the timeline, optionally completing all of its steps.
+
+        :param complete: If True, set every attribute that the remaining
+            steps would animate to its final value. Function calls that
+            have not yet happened are skipped.
+
+        """
+        if not self._running:
+            return
+        self._running = False
+        if complete:
+            pending = self._active + list(range(self._next, len(self.segments)))
+            for i in pending:
+                start, end, obj, attr, function, target = self.segments[i]
+                if attr is not None:
+                    setattr(obj, attr, target)
+        self._tick.cancel()
+        self.timelines.remove(self)
+
+
+def step(object, tween='linear', duration=1, tween_table=None, **targets):
+    """Describe an animation step for a sequence or parallel group."""
+    return Step(object, tween, duration, tween_table=tween_table, **targets)
+
+
+def wait(duration):
+    """Describe a pause in a sequence."""
+    return Step(None, duration=duration)
+
+
+def _timeline_segments(steps, parallel):
+    segments = []
+    duration = 0
+    for s in steps:
+        offset = 0 if parallel else duration
+        if isinstance(s, Step):
+            segments.extend(
+                (start + offset, end + offset, *rest)
+                for start, end, *rest in s.segments()
+            )
+            length = s.duration
+        elif isinstance(s, Timeline):
+            segments.extend(s._absorb(offset))
+            length = s.duration
+        elif callable(s):
+            segments.append((offset, offset, None, None, None, s))
+            length = 0
+        else:
+            raise TypeError(
+                'Timeline steps must be steps, timelines or functions, not %r'
+                % (s,)
+            )
+        if parallel:
+            duration = max(duration, length)
+        else:
+            duration += length
+    return segments, duration
+
+
+def sequence(*steps, on_finished=None):
+    """Run animation steps one after another.
+
+    Each step may be created with animate.step() or animate.wait(), or be a
+    nested sequence(), parallel() or keyframes(), or a function to call.
+
+    """
+    return Timeline(*_timeline_segments(steps, False), on_finished)
+
+
+def parallel(*steps, on_finished=None):
+    """Run animation steps at the same time.
+
+    The steps may be any of those accepted by sequence().
+
+    """
+    return Timeline(*_timeline_segments(steps, True), on_finished)
+
+
+def keyframes(object, tween='linear', on_finished=None, tween_table=None,
+              **tracks):
+    """Animate attributes of an object through a series of keyframes.
+
+    Each keyword argument is a list of (time, value) pairs for an attribute.
+    The attribute is set to the first value at the first time, and then
+    tweened between the values.
+
+    """
+    if tween_table is None:
+        tween_table = Animation.tween_table
+    function = tween_function(tween, tween_table)
+    segments = []
+    duration = 0
+    for attr, frames in tracks.items():
+        if not frames:
+            raise ValueError('No keyframes given for %s' % attr)
+        frames = sorted(frames, key=itemgetter(0))
+        first_time, first_value = frames[0]
+        segments.append(
+            (first_time, first_time, object, attr, function, first_value)
+        )
+        for (start, _), (end, value) in zip(frames, frames[1:]):
+            segments.append((start, end, object, attr, function, value))
+        duration = max(duration, frames[-1][0])
+    return Timeline(segments, duration, on_finished)
+
+
+animate.step = step
+animate.wait = wait
+animate.sequence = sequence
+animate.parallel = parallel
+animate.keyframes = keyframes
@@ -0,0 +1,168 @@
+"""Packing of many small images into a few large surfaces.
+
+Drawing from, and keeping in memory, a few large surfaces is cheaper than
+hundreds of small ones. An Atlas copies images into large "page" surfaces,
+and each image is then a subsurface of a page, which shares its pixels.
+
+"""
+import json
+import os
+
+import pygame
+
+
+__all__ = ['Atlas', 'pack']
+
+
+def pack(sizes, page_size):
+    """Pack rectangles of the given sizes into square pages.
+
+    This uses a simple shelf algorithm: rectangles are placed tallest first,
+    left to right along horizontal shelves, in the first shelf of any page
+    that has room.
+
+    Return a list of (page, x, y) for each size, in the same order, or None
+    for sizes that are too big for a page.
+
+    """
+    order = sorted(
+        range(len(sizes)),
+        key=lambda i: (sizes[i][1], sizes[i][0]),
+        reverse=True
+    )
+    # For each page, a list of shelves [y, height, x] and the next free y
+    pages = []
+    positions = [None] * len(sizes)
+    for i in order:
+        w, h = sizes[i]
+        if w > page_size or h > page_size:
+            continue
+        for pagenum, (shelves, _) in enumerate(pages):
+            for shelf in shelves:
+                y, shelf_h, x = shelf
+                if h <= shelf_h and x + w <= page_size:
+                    positions[i] = pagenum, x, y
+                    shelf[2] = x + w
+                    break
+            else:
+                continue
+            break
+        else:
+            for pagenum, page in enumerate(pages):
+                shelves, top = page
+                if top + h <= page_size:
+                    break
+            else:
+                pagenum = len(pages)
+                page = [[], 0]
+                pages.append(page)
+            shelves, top = page
+            shelves.append([top, h, w])
+            page[1] = top + h
+            positions[i] = pagenum, 0, top
+    return positions
+
+
+class Atlas:
+    """A set of images packed into page surfaces.
+
+    :param pages: A list of page Surfaces.
+    :param regions: A dict mapping image names to (page, x, y, w, h).
+
+    """
+
+    def __init__(self, pages, regions):
+        self.pages = pages
+        self.regions = regions
+
+    def __repr__(self):
+        return '<Atlas {} images in {} pages>'.format(
+            len(self.regions), len(self.pages)
+        )
+
+    def subsurface(self, name):
+        """Get the named image, as a subsurface of its page."""
+        page, x, y, w, h = self.regions[name]
+        return self.pages[page].subsurface((x, y, w, h))
+
+    @classmethod
+    def build(cls, images, page_size=1024, layout=None):
+        """Pack the given images into an Atlas.
+
+        :param images: A dict mapping names to Surfaces.
+        :param page_size: The width and height of each page.
+        :param layout: A path to a JSON file in which to save the positions
+                       of the images. If the file exists and describes the
+                       same images, it is used rather than packing again.
+
+        Images too big for a page are left out of the Atlas.
+
+        """
+        sizes = {name: surf.get_size() for name, surf in images.items()}
+        regions = cls._read_layout(layout, sizes, page_size)
+        if regions is None:
+            names = list(sizes)
+            positions = pack([sizes[n] for n in names], page_size)
+            regions = {
+                name: pos + sizes[name]
+                for name, pos in zip(names, positions)
+                if pos is not None
+            }
+            if layout:
+                cls._write_layout(layout, regions, page_size)
+
+        num_pages = max((r[0] for r in regions.values()), default=-1) + 1
+        extents = [[0, 0] for _ in range(num_pages)]
+        for page, x, y, w, h in regions.values():
+            extent = extents[page]
+            extent[0] = max(extent[0], x + w)
+            extent[1] = max(extent[1], y + h)
+
+        pages = [
+            pygame.Surface(extent, pygame.SRCALPHA).convert_alpha()
+            for extent in extents
+        ]
+        for page in pages:
+            page.fill((0, 0, 0, 0))
+        for name, (page, x, y, w, h) in regions.items():
+            # The page is transparent, so this copies the pixels exactly
+            pages[page].blit(
+                images[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX
+            )
+        return cls(pages, regions)
+
+    @staticmethod
+    def _read_layout(path, sizes, page_size):
+        """Read regions from a layout file, if it matches the images."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf8') as f:
+                data = json.load(f)
+            regions = {
+                name: tuple(region)
+                for name, region in data['regions'].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if data.get('page_size') != page_size:
+            return None
+        fits = {
+            name: size for name, size in sizes.items()
+            if size[0] <= page_size and size[1] <= page_size
+        }
+        if regions.keys() != fits.keys():
+            return None
+        for name, size in fits.items():
+            if regions[name][3:] != size:
+                return None
+        return regions
+
+    @staticmethod
+    def _write_layout(path, regions, page_size):
+        data = {
+            'page_size': page_size,
+            'regions': {name: list(r) for name, r in regions.items()},
+        }
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
@@ -6,11 +6,12 @@ classes in Pyglet.
 """
 import heapq
 from weakref import ref
-from functools import total_ordering
+from itertools import count
 from types import MethodType
 
 __all__ = [
-    'Clock', 'schedule', 'schedule_interval', 'unschedule'
+    'Clock', 'TimingWheelClock', 'schedule', 'schedule_interval',
+    'unschedule'
 ]
 
 # This type can't be weakreffed in Python 3.4
@@ -43,30 +44,67 @@ def mkref(o):
             raise
 
 
-@total_ordering
+def callback_key(cb):
+    """Get a key identifying the callback cb, without referencing it.
+
+    Bound methods are created afresh on each attribute access, so these are
+    identified by their instance and function.
+
+    """
+    if isinstance(cb, MethodType):
+        return id(cb.__self__), id(cb.__func__)
+    return id(cb)
+
+
 class Event:
     """An event scheduled for a future time.
 
-    Events are ordered by their scheduled execution time.
+    Callbacks scheduled with each_tick() are also represented by Events, with
+    a time of None.
+
+    Events are returned as handles from the Clock's scheduling methods, and
+    can be cancelled with cancel(). Clocks keep Events in their queues as
+    (time, sequence, event) tuples, so that they are ordered by time and then
+    by the order they were scheduled.
 
     """
 
-    def __init__(self, time, cb, repeat=None):
+    __slots__ = ('time', 'repeat', 'cb', 'func', 'key', 'clock', 'active')
+
+    def __init__(self, time, cb, repeat=None, clock=None):
         self.time = time
         self.repeat = repeat
-        self.cb = mkref(cb)
-        self.name = str(cb)
-        self.repeat = repeat
-
-    def __lt__(self, ano):
-        return self.time < ano.time
-
-    def __eq__(self, ano):
-        return self.time == ano.time
+        if isinstance(cb, MethodType):
+            # Rather than a closure from mkref(), keep the function and a
+            # weak reference to the instance
+            self.func = cb.__func__
+            self.cb = ref(cb.__self__)
+            self.key = id(cb.__self__), id(self.func)
+        else:
+            self.func = None
+            self.cb = mkref(cb)
+            self.key = id(cb)
+        self.clock = clock
+        self.active = True
 
     @property
     def callback(self):
-        return self.cb()
+        obj = self.cb()
+        if obj is None or self.func is None:
+            return obj
+        return MethodType(self.func, obj)
+
+    @property
+    def name(self):
+        return str(self.callback)
+
+    def __repr__(self):
+        return '<Event {} at {!r}>'.format(self.name, self.time)
+
+    def cancel(self):
+        """Cancel the event, if it has not already fired or been cancelled."""
+        if self.active:
+            self.clock._cancel(self)
 
 
 class Clock:
@@ -84,25 +122,83 @@ class Clock:
 
     """
 
+    # Cancelled events are left in the heap, and only removed when more than
+    # this many, and more than half of the heap, are cancelled.
+    MIN_COMPACT = 32
+
     def __init__(self):
         self.t = 0
         self.fired = False
-        self.events = []
         self._each_tick = []
+        # callback_key -> {Event: None}, a dict rather than a list so that
+        # events can be removed in constant time, in the order they were added
+        self._by_callback = {}
+        self._each_tick_cancelled = False
+        self._seq = count()
+        self._reset_events()
+
+    def _reset_events(self):
+        self.events = []
+        self._cancelled = 0  # number of cancelled events in self.events
 
     def clear(self):
         """Remove all handlers from this clock."""
-        self.events.clear()
+        for events in self._by_callback.values():
+            for ev in events:
+                ev.active = False
+        self._by_callback.clear()
         self._each_tick.clear()
+        self._each_tick_cancelled = False
+        self._reset_events()
+
+    def _add(self, ev):
+        self._by_callback.setdefault(ev.key, {})[ev] = None
+        if ev.time is None:
+            self._each_tick.append(ev)
+        else:
+            self._push(ev)
+        return ev
+
+    def _push(self, ev):
+        heapq.heappush(self.events, (ev.time, next(self._seq), ev))
+
+    def _unindex(self, ev):
+        events = self._by_callback.get(ev.key)
+        if events:
+            events.pop(ev, None)
+            if not events:
+                del self._by_callback[ev.key]
+
+    def _deactivate(self, ev):
+        """Mark an event as cancelled, leaving it to be removed lazily."""
+        ev.active = False
+        if ev.time is None:
+            self._each_tick_cancelled = True
+        else:
+            self._cancelled += 1
+
+    def _cancel(self, ev):
+        self._unindex(ev)
+        self._deactivate(ev)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Remove cancelled events from the heap, if there are many."""
+        cancelled = self._cancelled
+        if cancelled > self.MIN_COMPACT and cancelled * 2 > len(self.events):
+            self.events = [e for e in self.events if e[2].active]
+            heapq.heapify(self.events)
+            self._cancelled = 0
 
     def schedule(self, callback, delay):
         """Schedule callback to be called once, at `delay` seconds from now.
 
         :param callback: A parameterless callable to be called.
         :param delay: The delay before the call (in clock time / seconds).
+        :return: An Event, whose cancel() method unschedules this call.
 
         """
-        heapq.heappush(self.events, Event(self.t + delay, callback, None))
+        return self._add(Event(self.t + delay, callback, None, self))
 
     def schedule_unique(self, callback, delay):
         """Schedule callback to be called once, at `delay` seconds from now.
@@ -111,10 +207,11 @@ class Clock:
 
         :param callback: A parameterless callable to be called.
         :param delay: The delay before the call (in clock time / seconds).
+        :return: An Event, whose cancel() method unschedules this call.
 
         """
         self.unschedule(callback)
-        self.schedule(callback, delay)
+        return self.schedule(callback, delay)
 
     def schedule_interval(self, callback, delay):
         """Schedule callback to be called every `delay` seconds.
@@ -123,9 +220,10 @@ class Clock:
 
         :param callback: A parameterless callable to be called.
         :param delay: The interval in seconds.
+        :return: An Event, whose cancel() method stops further calls.
 
         """
-        heapq.heappush(self.events, Event(self.t + delay, callback, delay))
+        return self._add(Event(self.t + delay, callback, delay, self))
 
     def unschedule(self, callback):
         """Unschedule the given callback.
@@ -133,13 +231,9 @@ class Clock:
         If scheduled multiple times all instances will be unscheduled.
 
         """
-        self.events = [
-            e for e in self.events
-            if e.callback != callback
-            if e.callback is not None
-        ]
-        heapq.heapify(self.events)
-        self._each_tick = [e for e in self._each_tick if e() != callback]
+        for ev in self._by_callback.pop(callback_key(callback), ()):
+            self._deactivate(ev)
+        self._maybe_compact()
 
     def each_tick(self, callback):
         """Schedule a callback to be called every tick.
@@ -147,22 +241,31 @@ class Clock:
         Unlike the standard scheduler functions, the callable is passed the
         elapsed clock time since the last call (the same value passed to tick).
 
+        :return: An Event, whose cancel() method stops further calls.
+
         """
-        self._each_tick.append(mkref(callback))
+        return self._add(Event(None, callback, None, self))
 
     def _fire_each_tick(self, dt):
-        dead = [None]
-        for r in self._each_tick:
-            cb = r()
-            if cb is not None:
-                self.fired = True
-                try:
-                    cb(dt)
-                except Exception:
-                    import traceback
-                    traceback.print_exc()
-                    dead.append(cb)
-        self._each_tick = [e for e in self._each_tick if e() not in dead]
+        # Callbacks may be added to the list while we iterate over it, but
+        # cancelled callbacks are only removed once we are done.
+        for ev in self._each_tick:
+            if not ev.active:
+                continue
+            cb = ev.callback
+            if cb is None:
+                self._cancel(ev)
+                continue
+            self.fired = True
+            try:
+                cb(dt)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                self._cancel(ev)
+        if self._each_tick_cancelled:
+            self._each_tick = [e for e in self._each_tick if e.active]
+            self._each_tick_cancelled = False
 
     def tick(self, dt):
         """Update the clock time and fire all scheduled events.
@@ -173,22 +276,184 @@ class Clock:
         self.fired = False
         self.t += float(dt)
         self._fire_each_tick(dt)
-        while self.events and self.events[0].time <= self.t:
-            ev = heapq.heappop(self.events)
-            cb = ev.callback
-            if not cb:
-                continue
+        self._fire_events()
+
+    def _fire_events(self):
+        """Fire all events scheduled for up to the current time."""
+        while self.events and self.events[0][0] <= self.t:
+            ev = heapq.heappop(self.events)[2]
+            if ev.active:
+                self._fire(ev)
+            else:
+                self._cancelled -= 1
+
+    def _fire(self, ev):
+        """Fire an event that is due, re-scheduling it if it repeats."""
+        cb = ev.callback
+        if not cb:
+            ev.active = False
+            self._unindex(ev)
+            return
+
+        if ev.repeat is not None:
+            ev.time = self.t + ev.repeat
+            self._push(ev)
+        else:
+            ev.active = False
+            self._unindex(ev)
+
+        self.fired = True
+        try:
+            cb()
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            self.unschedule(cb)
 
-            if ev.repeat is not None:
-                self.schedule_interval(cb, ev.repeat)
 
-            self.fired = True
-            try:
-                cb()
-            except Exception:
-                import traceback
-                traceback.print_exc()
-                self.unschedule(cb)
+class TimingWheelClock(Clock):
+    """A clock that stores scheduled events in a hierarchical timing wheel.
+
+    This has the same interface as Clock, but scheduling an event takes
+    constant time however many events are scheduled, and each tick only
+    looks at the events due in the time that has elapsed. This makes it
+    faster than Clock when there are thousands of short-lived timers.
+
+    Time is divided into slots of `resolution` seconds. The first wheel has
+    a slot for each of the next 64 slots of time, the next wheel a slot for
+    each 64 of those, and so on. Events move down to finer wheels as their
+    time approaches. Events due in the same tick still fire in time order.
+
+    :param resolution: The length of time covered by each slot, in seconds.
+    :param levels: The number of wheels. Events further in the future than
+                   the wheels cover are kept in an overflow list.
+
+    """
+
+    # The first wheel is hard-coded to these sizes in _push()
+    SLOT_BITS = 6
+    SLOT_MASK = 63
+
+    def __init__(self, resolution=0.005, levels=4):
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if levels < 1:
+            raise ValueError("There must be at least one level")
+        self.resolution = resolution
+        self.levels = levels
+        self._per_tick = 1 / resolution
+        super().__init__()
+
+    def _reset_events(self):
+        self._wheels = [
+            [[] for _ in range(self.SLOT_MASK + 1)]
+            for _ in range(self.levels)
+        ]
+        self._counts = [0] * self.levels  # number of events on each wheel
+        self._overflow = []
+        self._now = self._current_tick()
+        self._cancelled = 0  # number of cancelled events in the wheels
+
+    def _maybe_compact(self):
+        """Cancelled events are dropped as their slots come round."""
+
+    def _push(self, ev):
+        self._insert((ev.time, next(self._seq), ev))
+
+    def _insert(self, entry):
+        now = self._now
+        tick = int(entry[0] * self._per_tick)
+        if tick <= now:
+            tick = now
+        elif tick >> 6 != now >> 6:
+            self._insert_far(entry, tick)
+            return
+        # Most events are due soon, so go straight to the first wheel
+        self._wheels[0][tick & 63].append(entry)
+        self._counts[0] += 1
+
+    def _insert_far(self, entry, tick):
+        now = self._now
+        for level in range(1, self.levels):
+            shift = self.SLOT_BITS * (level + 1)
+            if tick >> shift == now >> shift:
+                slot = (tick >> (shift - self.SLOT_BITS)) & self.SLOT_MASK
+                self._wheels[level][slot].append(entry)
+                self._counts[level] += 1
+                return
+        self._overflow.append(entry)
+
+    def _current_tick(self):
+        return max(int(self.t * self._per_tick), 0)
+
+    def _fire_events(self):
+        target = self._current_tick()
+        wheels = self._wheels
+        wheel = wheels[0]
+        while True:
+            slot = wheel[self._now & 63]
+            while slot:
+                t = self.t
+                if self._now < target:
+                    # The whole of this slot's time has passed
+                    due = slot[:]
+                    slot.clear()
+                else:
+                    due = [e for e in slot if e[0] <= t]
+                    if not due:
+                        break
+                    slot[:] = [e for e in slot if e[0] > t]
+                self._counts[0] -= len(due)
+                due.sort()
+                for _, _, ev in due:
+                    if ev.active:
+                        self._fire(ev)
+                    else:
+                        self._cancelled -= 1
+                if self._wheels is not wheels:
+                    # The clock was cleared by a callback
+                    return
+            if self._now >= target:
+                return
+            self._advance(target)
+
+    def _advance(self, target):
+        """Advance the current tick towards target, cascading events down.
+
+        Ticks are skipped while the wheels that would be looked at are empty.
+
+        """
+        bits = self.SLOT_BITS
+        step = 1
+        for n in self._counts:
+            if n:
+                break
+            step <<= bits
+        else:
+            if not self._overflow:
+                self._now = target
+                return
+        now = self._now = min(target, (self._now // step + 1) * step)
+
+        if now % (1 << bits * self.levels) == 0:
+            overflow = self._overflow
+            self._overflow = []
+            self._repush(overflow)
+
+        for level in range(self.levels - 1, 0, -1):
+            if now % (1 << bits * level) == 0:
+                slot = self._wheels[level][(now >> bits * level) & self.SLOT_MASK]
+                self._counts[level] -= len(slot)
+                events = slot[:]
+                slot.clear()
+                self._repush(events)
+
+    def _repush(self, entries):
+        for entry in entries:
+            if entry[2].active:
+                self._insert(entry)
+            else:
+                self._cancelled -= 1
 
 
 # One instance of a clock is available by default, to simplify the API
@@ -0,0 +1,199 @@
+"""Spatial indexing for collision detection between large numbers of Actors.
+
+Testing every Actor against every other Actor is quadratic in the number of
+Actors. A SpatialHash divides the plane into a uniform grid of square cells
+and only tests objects that share a cell, which makes "broad-phase" collision
+detection close to linear for typical game scenes.
+
+"""
+from math import floor
+
+from .actor import Actor
+from .rect import ZRect
+
+__all__ = ['SpatialHash']
+
+
+def _xywh(obj):
+    """Get the (x, y, w, h) of an Actor or any rect-like object."""
+    r = getattr(obj, '_rect', None)
+    if r is None:
+        r = ZRect(obj)
+    return r.x, r.y, r.w, r.h
+
+
+class SpatialHash:
+    """A uniform grid index of Actors, for fast collision queries.
+
+    Actors added to the index are kept up to date automatically when they are
+    moved, resized or rotated. Other hashable objects with a ``rect`` may also
+    be added, but ``update()`` must be called after moving them, as must
+    in-place rect methods like ``actor.move_ip()``.
+
+    :param cell_size: The width and height of a grid cell, in pixels. This
+        should be roughly the size of a typical object in the index.
+
+    """
+
+    def __init__(self, cell_size=64):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells = {}  # (cx, cy) -> {obj: None}, used as an ordered set
+        self._ranges = {}  # obj -> (cx0, cy0, cx1, cy1)
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __iter__(self):
+        return iter(list(self._ranges))
+
+    def __contains__(self, obj):
+        return obj in self._ranges
+
+    def __repr__(self):
+        return '<{} cell_size={!r} objects={}>'.format(
+            type(self).__name__, self.cell_size, len(self._ranges)
+        )
+
+    def _cell_range(self, x, y, w, h):
+        size = self.cell_size
+        return (
+            floor(x / size),
+            floor(y / size),
+            floor((x + w) / size),
+            floor((y + h) / size),
+        )
+
+    def _insert(self, obj, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[cx, cy] = {obj: None}
+                else:
+                    cell[obj] = None
+        self._ranges[obj] = cell_range
+
+    def _discard(self, obj, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells[cx, cy]
+                del cell[obj]
+                if not cell:
+                    del cells[cx, cy]
+        del self._ranges[obj]
+
+    def add(self, obj):
+        """Add an Actor (or other object with a rect) to the index."""
+        if obj in self._ranges:
+            return
+        self._insert(obj, self._cell_range(*_xywh(obj)))
+        if isinstance(obj, Actor):
+            obj._spatial_indexes += (self,)
+
+    def remove(self, obj):
+        """Remove an object from the index.
+
+        Raise KeyError if the object is not in the index.
+
+        """
+        self._discard(obj, self._ranges[obj])
+        if isinstance(obj, Actor):
+            obj._spatial_indexes = tuple(
+                i for i in obj._spatial_indexes if i is not self
+            )
+
+    def discard(self, obj):
+        """Remove an object from the index, if it is present."""
+        if obj in self._ranges:
+            self.remove(obj)
+
+    def clear(self):
+        """Remove all objects from the index."""
+        for obj in list(self._ranges):
+            self.remove(obj)
+
+    def update(self, obj):
+        """Update the cells an object occupies after it has moved."""
+        old = self._ranges[obj]
+        new = self._cell_range(*_xywh(obj))
+        if new != old:
+            self._discard(obj, old)
+            self._insert(obj, new)
+
+    def _candidates(self, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self._cells
+        if cx0 == cx1 and cy0 == cy1:
+            return cells.get((cx0, cy0), ())
+        found = {}
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def query_rect(self, rect):
+        """Return a list of the objects that collide with the given rect.
+
+        The rect may be anything accepted by ZRect, including an Actor.
+        Collision follows the same rules as ``ZRect.colliderect()``.
+
+        """
+        x, y, w, h = _xywh(rect)
+        right = x + w
+        bottom = y + h
+        result = []
+        for obj in self._candidates(self._cell_range(x, y, w, h)):
+            if obj is rect:
+                continue
+            ox, oy, ow, oh = _xywh(obj)
+            if x < ox + ow and y < oy + oh and right > ox and bottom > oy:
+                result.append(obj)
+        return result
+
+    def query_point(self, *args):
+        """Return a list of the objects that contain the given point.
+
+        Collision follows the same rules as ``ZRect.collidepoint()``.
+
+        """
+        if len(args) == 1:
+            px, py = args[0]
+        else:
+            px, py = args
+        size = self.cell_size
+        cell = self._cells.get((floor(px / size), floor(py / size)), ())
+        result = []
+        for obj in cell:
+            x, y, w, h = _xywh(obj)
+            if x <= px < x + w and y <= py < y + h:
+                result.append(obj)
+        return result
+
+    def all_pairs(self):
+        """Iterate over all pairs of objects in the index that collide.
+
+        Each colliding pair is yielded once, as a tuple ``(a, b)``.
+
+        """
+        seen = set()
+        for cell in list(self._cells.values()):
+            if len(cell) < 2:
+                continue
+            objs = [(obj, _xywh(obj)) for obj in cell]
+            for i, (a, (ax, ay, aw, ah)) in enumerate(objs):
+                ar = ax + aw
+                ab = ay + ah
+                for b, (bx, by, bw, bh) in objs[i + 1:]:
+                    if ax < bx + bw and ay < by + bh and ar > bx and ab > by:
+                        key = (id(a), id(b)) if id(a) < id(b) else (id(b), id(a))
+                        if key not in seen:
+                            seen.add(key)
+                            yield a, b
@@ -12,11 +12,19 @@ import pgzero.loaders
 import pgzero.screen
 
 from . import constants
+from .profiler import FrameProfiler, PHASES
 
 
 screen = None  # This global surface is what actors draw to
 DISPLAY_FLAGS = pygame.SHOWN
 
+# The frame rate used if the game doesn't set FPS
+DEFAULT_FPS = 60
+
+# time.sleep() can overshoot by a millisecond or more; we sleep until this
+# long (in s) before the next frame is due, then busy-wait the remainder.
+SPIN_TIME = 0.002
+
 
 def exit():
     """Wait for up to a second for all sounds to play out
@@ -49,11 +57,36 @@ class PGZeroGame:
     def __init__(
         self,
         mod: types.ModuleType,
-        fps: bool = False
+        fps: bool = False,
+        max_fps: float = None,
+        overlay: bool = False,
+        profile_out: str = None,
+        headless: bool = False,
+        max_frames: int = None,
+        input_events: dict = None
     ):
         """Construct a game loop given the pgzero module mod.
 
-        If fps is True, show a FPS count at the bottom left of the window.
+        If fps is True, print periodic frame time statistics to stdout.
+
+        If max_fps is given, it overrides the frame rate set by the module's
+        FPS constant; 0 means run as fast as possible.
+
+        If overlay is True, show frame timings at the bottom left of the
+        window.
+
+        If profile_out is given, write a JSON line of timings for every frame
+        to this path.
+
+        If headless is True, run as fast as possible but pass update() a
+        fixed dt of one frame at the game's FPS, and print a timing report
+        at the end. The caller is responsible for selecting SDL's dummy
+        video driver.
+
+        If max_frames is given, return after running that many frames.
+
+        input_events may map frame numbers to lists of Pygame events, which
+        will be posted to the event queue at the start of that frame.
         """
         self.mod = mod
         self.screen = None
@@ -62,9 +95,21 @@ class PGZeroGame:
         self.title = None
         self.icon = None
         self.fps = fps
+        self.max_fps = max_fps
+        self.overlay = overlay
+        self.profiler = FrameProfiler(out=profile_out)
+        self._overlay_text = ''
+        self.headless = headless
+        self.max_frames = max_frames
+        self.input_events = input_events or {}
         self.keyboard = pgzero.keyboard.keyboard
         self.handlers = {}
 
+        # The fixed timestep, if UPDATE_RATE is set, and the fraction of a
+        # step that had not yet been simulated when draw() was called
+        self.timestep = None
+        self.alpha = 1.0
+
     def reinit_screen(self) -> bool:
         """Reinitialise the window.
 
@@ -85,7 +130,7 @@ class PGZeroGame:
             self.screen = pygame.display.set_mode(
                 (w, h),
                 DISPLAY_FLAGS,
-                vsync=1
+                vsync=1 if self.get_max_fps() else 0
             )
             pgzero.screen.screen_instance._set_surface(self.screen)
 
@@ -193,6 +238,14 @@ class PGZeroGame:
 
         return new_handler
 
+    def get_max_fps(self):
+        """Get the target frame rate, or 0 to run as fast as possible."""
+        if self.headless:
+            return 0
+        if self.max_fps is not None:
+            return self.max_fps
+        return getattr(self.mod, 'FPS', DEFAULT_FPS)
+
     def get_update_func(self):
         """Get a one-argument update function.
 
@@ -217,9 +270,20 @@ class PGZeroGame:
             return update
 
     def get_draw_func(self):
-        """Get a draw function.
+        """Get a zero-argument draw function.
+
+        If the module defines a function matching ::
 
-        If no draw function is define, raise an exception.
+            draw()
+
+        or ::
+
+            draw(alpha)
+
+        then this will be called. In the latter case, draw() is passed the
+        interpolation fraction between fixed update steps (see UPDATE_RATE).
+
+        If draw() takes any other arguments, raise an exception.
 
         """
         try:
@@ -227,9 +291,12 @@ class PGZeroGame:
         except AttributeError:
             return lambda: None
         else:
-            if draw.__code__.co_argcount != 0:
+            argcount = draw.__code__.co_argcount
+            if argcount == 1:
+                return lambda: draw(self.alpha)
+            if argcount != 0:
                 raise TypeError(
-                    "draw() must not take any arguments."
+                    "draw() must take no arguments, or one argument (alpha)."
                 )
             return draw
 
@@ -238,6 +305,7 @@ class PGZeroGame:
         try:
             self.mainloop()
         finally:
+            self.profiler.close()
             pygame.display.quit()
             pygame.mixer.quit()
 
@@ -274,101 +342,200 @@ class PGZeroGame:
         Return True if an event was handled.
         """
         updated = False
+        mark = self.profiler.mark
 
         for event in pygame.event.get():
             handler = self.handlers.get(event.type)
             if handler:
                 handler(event)
                 updated = True
+        mark('events')
 
         clock = pgzero.clock.clock
-        clock.tick(dt)
-        updated |= clock.fired
+        if self.timestep:
+            steps, self.alpha = self.timestep.advance(dt)
+            step_dt = self.timestep.step
+            for _ in range(steps):
+                clock.tick(step_dt)
+                updated |= clock.fired
+                mark('clock')
+                if update:
+                    update(step_dt)
+                    mark('update')
+            # With interpolation, each frame is drawn differently
+            updated |= bool(update)
+        else:
+            clock.tick(dt)
+            updated |= clock.fired
+            mark('clock')
 
-        if update:
-            update(dt)
-            updated = True
+            if update:
+                update(dt)
+                updated = True
+                mark('update')
 
         updated |= self.reinit_screen()
+        mark('events')
         return updated
 
+    def draw_overlay(self, frame):
+        """Draw frame timings at the bottom left of the screen."""
+        profiler = self.profiler
+        if frame % 30 == 0 or not self._overlay_text:
+            total = profiler.stats()
+            phases = '  '.join(
+                f"{phase} {profiler.stats(phase)['mean']:0.1f}"
+                for phase in PHASES
+            )
+            self._overlay_text = (
+                f"{profiler.fps():0.1f} fps  frame {total['mean']:0.1f}ms "
+                f"p99 {total['p99']:0.1f}ms\n{phases}"
+            )
+        pgzero.screen.screen_instance.draw.text(
+            self._overlay_text,
+            bottomleft=(4, self.height - 4),
+            fontsize=16,
+            color='white',
+            owidth=1,
+            ocolor='black',
+        )
+
     def mainloop(self):
         """Run the main loop of Pygame Zero."""
         self.reinit_screen()
 
+        update_rate = getattr(self.mod, 'UPDATE_RATE', None)
+        if update_rate:
+            self.timestep = FixedTimestep(update_rate)
+
         update = self.get_update_func()
         draw = self.get_draw_func()
         self.load_handlers()
         self.inject_global_handlers()
 
-        logic_timer = Timer('logic', print=self.fps)
-        draw_timer = Timer('draw', print=self.fps)
-        for i, dt in enumerate(frames(60)):
-            with logic_timer:
-                updated = self.handle_events(dt, update)
+        dirty_rects = getattr(self.mod, 'DIRTY_RECTS', False)
+        screen_instance = pgzero.screen.screen_instance
+        screen_instance._set_dirty_tracking(dirty_rects)
+
+        fixed_dt = None
+        if self.headless:
+            fixed_dt = 1 / (getattr(self.mod, 'FPS', DEFAULT_FPS) or DEFAULT_FPS)
+
+        profiler = self.profiler
+        start = perf_counter()
+        for i, real_dt in enumerate(frames(self.get_max_fps())):
+            if i == self.max_frames:
+                break
+            dt = fixed_dt or real_dt
+            for event in self.input_events.get(i, ()):
+                pygame.event.post(event)
+
+            profiler.start_frame()
+            updated = self.handle_events(dt, update)
+
+            if updated or self.overlay:
+                draw()
+                if self.overlay:
+                    self.draw_overlay(i)
+                profiler.mark('draw')
+
+                rects = None
+                if dirty_rects:
+                    rects = screen_instance._take_dirty_rects()
+                if rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
+                profiler.mark('flip')
+
+            profiler.end_frame(real_dt)
+            if self.fps and i and i % 60 == 0:
+                print(profiler.summary())
+
+        if self.headless:
+            elapsed = perf_counter() - start
+            print(
+                f"Ran {profiler.count} frames in {elapsed:0.2f}s: "
+                f"{profiler.count / elapsed:0.1f} fps"
+            )
+            print(profiler.summary())
+
+
+def wait_until(deadline):
+    """Wait until perf_counter() reaches deadline.
+
+    We sleep for most of the time, then spin for the last SPIN_TIME seconds,
+    for more accurate timing than sleep() alone.
+
+    """
+    remaining = deadline - perf_counter()
+    if remaining > SPIN_TIME:
+        sleep(remaining - SPIN_TIME)
+    while perf_counter() < deadline:
+        pass
 
-            if updated:
-                with draw_timer:
-                    draw()
 
-                if self.fps and i and i % 60 == 0:
-                    ftime_ms = draw_timer.get_mean() + logic_timer.get_mean()
-                    fps = 1000 / ftime_ms
+def frames(fps=DEFAULT_FPS):
+    """Iterate over frames at the given fps, yielding time delta (in s).
 
-                    print(f"fps: {fps:0.1f}  time per frame: {ftime_ms:0.1f}ms")
-                pygame.display.flip()
+    If fps is 0 or None, don't wait between frames at all.
 
+    """
+    if not fps:
+        t = perf_counter()
+        dt = 0.0
+        while True:
+            yield dt
+            nextt = perf_counter()
+            dt = nextt - t
+            t = nextt
 
-def frames(fps=60):
-    """Iterate over frames at the given fps, yielding time delta (in s)."""
     tgt = 1 / fps  # target frame time
 
     t = perf_counter()
+    deadline = t + tgt
     dt = tgt
 
     while True:
         yield dt
+        wait_until(deadline)
         nextt = perf_counter()
         dt = nextt - t
-        if dt < tgt:
-            sleep(tgt - dt)
-            nextt = perf_counter()
-            dt = nextt - t
         t = nextt
 
+        # Schedule frames at regular intervals, unless we've fallen behind,
+        # in which case don't try to catch up.
+        deadline += tgt
+        if deadline < nextt:
+            deadline = nextt + tgt
 
-class Timer:
-    """Context manager to time the game loop."""
-
-    __slots__ = (
-        'name',
-        'total', 'count', 'worst',
-        'start',
-        'print',
-    )
-
-    def __init__(self, name, print=False):
-        self.name = name
-        self.total = 0
-        self.count = 0
-        self.worst = 0
-        self.print = print
-
-    def __enter__(self):
-        self.start = perf_counter()
-
-    def __exit__(self, *_):
-        t = (perf_counter() - self.start) * 1e3
-        self.count += 1
-        self.total += t
-        if t > self.worst:
-            self.worst = t
-
-    def get_mean(self) -> float:
-        mean = self.total / self.count
-        if self.print:
-            print(
-                f"{self.name} mean: {mean:0.1f}ms  "
-                f"worst: {self.worst:0.1f}ms")
-        self.worst = self.total = self.count = 0
-        return mean
+
+class FixedTimestep:
+    """Divide variable frame times into a whole number of fixed steps.
+
+    Time that doesn't make up a whole step is carried over to the next frame.
+    If more than max_steps are due in one frame (for example, because the
+    game is running too slowly to keep up) the extra time is discarded rather
+    than making the next frame even slower.
+
+    """
+
+    def __init__(self, rate, max_steps=5):
+        if rate <= 0:
+            raise ValueError("UPDATE_RATE must be positive")
+        self.step = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, dt):
+        """Advance by dt seconds.
+
+        Return the number of steps to run and the interpolation fraction: how
+        far the real time is between the last step and the next, from 0 to 1.
+
+        """
+        self.accumulator += dt
+        # Allow for rounding error, so that eg. 0.03s is 3 steps of 0.01s
+        steps = int(self.accumulator / self.step + 1e-9)
+        self.accumulator = max(self.accumulator - steps * self.step, 0.0)
+        return min(steps, self.max_steps), self.accumulator / self.step
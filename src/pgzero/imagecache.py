@@ -0,0 +1,150 @@
+"""An on-disk cache of decoded images.
+
+Decoding PNG or JPEG files is slow. This cache stores the raw pixels of each
+image in a file, which can be mapped into memory almost instantly the next
+time the game runs. Entries are keyed by the image's path, modification time
+and size, so changing an image file means it is decoded again; the entry for
+the old version of the file is then deleted.
+
+"""
+import mmap
+import os
+import struct
+import tempfile
+from hashlib import sha1
+
+import pygame.image
+
+from .storage import _get_platform_cache_path
+
+
+__all__ = ['ImageCache']
+
+
+# The BGRA pixel format needs Pygame 2.1.3, which also renamed tostring() to
+# tobytes(). With older versions, images are never cached.
+_tobytes = getattr(pygame.image, 'tobytes', None)
+
+# Each file is a header of (magic, width, height), then the pixels. BGRA is
+# the usual layout of surfaces converted with convert_alpha().
+MAGIC = b'PGZI\x01'
+HEADER = struct.Struct('<5sII')
+PIXEL_FORMAT = 'BGRA'
+
+
+class ImageCache:
+    """A directory of decoded images.
+
+    :param directory: The directory for the cache files. By default, this is
+                      in the same configuration directory as storage.
+
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or _get_platform_cache_path()
+        # The names of the files in the directory, as {prefix: {name}}, read
+        # on the first save (see _prune())
+        self._names = None
+
+    def __repr__(self):
+        return '<ImageCache {!r}>'.format(self.directory)
+
+    @staticmethod
+    def _prefix(path):
+        """Get the start of the names of cache files for the image at path."""
+        return sha1(os.path.abspath(path).encode('utf8')).hexdigest() + '-'
+
+    def _cache_path(self, path):
+        st = os.stat(path)
+        name = '{}{:x}-{:x}.pgzimg'.format(
+            self._prefix(path), st.st_mtime_ns, st.st_size
+        )
+        return os.path.join(self.directory, name)
+
+    def load(self, path):
+        """Get a Surface for the image file at path, or None if not cached.
+
+        The Surface's pixels are mapped from the cache file, so it should be
+        converted (for example with convert_alpha()) before use.
+
+        """
+        try:
+            with open(self._cache_path(path), 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, w, h = HEADER.unpack_from(mm)
+        except struct.error:
+            return None
+        if magic != MAGIC or len(mm) != HEADER.size + w * h * 4:
+            return None
+        pixels = memoryview(mm)[HEADER.size:]
+        try:
+            return pygame.image.frombuffer(pixels, (w, h), PIXEL_FORMAT)
+        except ValueError:
+            # The pixel format isn't supported by this version of Pygame
+            return None
+
+    def save(self, path, surf):
+        """Store the pixels of surf, which was loaded from path."""
+        if _tobytes is None:
+            return
+        try:
+            dest = self._cache_path(path)
+            os.makedirs(self.directory, exist_ok=True)
+            w, h = surf.get_size()
+            data = _tobytes(surf, PIXEL_FORMAT)
+            # Write to a temporary file first, so that a game running at the
+            # same time never sees a partly written file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except (OSError, ValueError):
+            # The cache is only an optimisation
+            return
+        try:
+            with open(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, w, h))
+                f.write(data)
+            os.replace(tmp, dest)
+        except OSError:
+            self._remove(tmp)
+            return
+        self._prune(path, dest)
+
+    def _prune(self, path, keep):
+        """Delete the files cached for older versions of the image at path."""
+        if self._names is None:
+            # List the directory only once, rather than on every save
+            self._names = {}
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                names = []
+            for name in names:
+                if name.endswith('.pgzimg'):
+                    prefix = name.split('-', 1)[0] + '-'
+                    self._names.setdefault(prefix, set()).add(name)
+        keep = os.path.basename(keep)
+        prefix = self._prefix(path)
+        for name in self._names.pop(prefix, ()):
+            if name != keep:
+                self._remove(os.path.join(self.directory, name))
+        self._names[prefix] = {keep}
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Delete all of the files in the cache."""
+        self._names = None
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(('.pgzimg', '.tmp')):
+                os.remove(os.path.join(self.directory, name))
@@ -1,10 +1,15 @@
 import os
 import os.path
 import sys
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 
 import pygame.image
 import pygame.mixer
 
+from . import clock
 from . import ptext
 
 
@@ -85,12 +90,37 @@ class ResourceLoader:
     Additionally, attribute access can be used to access and cache resources.
     Dotted paths can be used to traverse directories.
 
+    If max_bytes is set, the least recently used resources are unloaded when
+    the cache grows larger than this. Only resources that nothing else refers
+    to (such as an Actor using an image) and that are not pinned are unloaded.
+
     """
 
+    _max_bytes = None
+
     def __init__(self, subpath):
         self._subpath = subpath
-        self._cache = {}
+        # Resources by cache key, least recently used first
+        self._cache = OrderedDict()
+        self._sizes = {}
+        self._pinned = set()
+        # Weak sets of the Actors using each resource, by cache key; these
+        # resources are not unloaded to stay within max_bytes
+        self._users = {}
+        # Resources unloaded to stay within max_bytes that may still be in
+        # use elsewhere; load() takes these back rather than loading again
+        self._evicted = weakref.WeakValueDictionary()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = 0
+        # Futures for resources being decoded in the background, and errors
+        # from those that failed, by cache key
+        self._pending = {}
+        self._failed = {}
         self._have_root = False
+        # Index of the files in the directory (see _get_index())
+        self._index = None
+        self._index_root = None
+        self._index_dirs = ()
 
     def validate_root(self, name):
         r = self._root()
@@ -113,11 +143,61 @@ class ResourceLoader:
         kwpairs = sorted(kwargs.items())
         return (name, args, tuple(kwpairs))
 
-    def load(self, name, *args, **kwargs):
-        key = self.cache_key(name, args, kwargs)
-        if key in self._cache:
-            return self._cache[key]
+    def _build_index(self):
+        """Scan the directory for resources, returning a dict of name: path.
+
+        Each file is indexed by its name both with and without its extension,
+        with the first extension in EXTNS taking precedence. Names that are
+        not lower case are left out, so that loading them reports the error.
+
+        """
+        r = self._root()
+        index = {}
+        dirs = set()
+        if not os.path.isdir(r):
+            return index, dirs
+        validate_compatible_path(r)
+
+        by_stem = []
+        extns = {ext: i for i, ext in enumerate(self.EXTNS)}
+        for dirpath, dirnames, filenames in os.walk(r):
+            rel = os.path.relpath(dirpath, r)
+            prefix = '' if rel == '.' else rel.replace(os.sep, '/') + '/'
+            for d in dirnames:
+                dirs.add(prefix + d)
+            for f in filenames:
+                name = prefix + f
+                if name.lower() != name:
+                    continue
+                path = os.path.join(dirpath, f)
+                index[name] = path
+                stem, ext = os.path.splitext(name)
+                priority = extns.get(ext[1:])
+                if priority is not None:
+                    by_stem.append((priority, stem, path))
+        for _, stem, path in sorted(by_stem):
+            index.setdefault(stem, path)
+        return index, dirs
+
+    def _get_index(self):
+        if self._index is None or self._index_root != root:
+            self._index, self._index_dirs = self._build_index()
+            self._index_root = root
+        return self._index
+
+    def refresh(self):
+        """Re-scan the directory for resources that were added or removed."""
+        self._index = None
+        self._have_root = False
 
+    def _find(self, name):
+        """Get the validated path of the named resource."""
+        path = self._get_index().get(name)
+        if path is not None:
+            return path
+
+        # Not in the index: perhaps the file was created since the index was
+        # built, or we need to report an error
         if not self._have_root:
             self.validate_root(name)
         p = os.path.join(self._root(), name)
@@ -137,20 +217,201 @@ class ResourceLoader:
                 )
 
         validate_compatible_path(p)
-        res = self._cache[key] = self._load(p, *args, **kwargs)
+        return p
+
+    def load(self, name, *args, **kwargs):
+        key = self.cache_key(name, args, kwargs)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self._hits += 1
+            return cache[key]
+
+        res = self._evicted.pop(key, None)
+        if res is not None:
+            self._hits += 1
+            self._store(key, res)
+            return res
+
+        self._misses += 1
+        error = self._failed.pop(key, None)
+        if error is not None:
+            # Preloading failed; report it now that the resource is needed
+            raise error
+        future = self._pending.pop(key, None)
+        if future is not None:
+            # Being preloaded; wait for it rather than decoding it again
+            res = self._finish(future.result())
+        else:
+            res = self._load(self._find(name), *args, **kwargs)
+        self._store(key, res)
+        return res
+
+    @property
+    def max_bytes(self):
+        """The most memory the cache may use, in bytes, or None for no limit."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        if max_bytes is not None and self._bytes > max_bytes:
+            self._evict(None)
+
+    def _sizeof(self, res):
+        """Get the number of bytes of memory used by a resource."""
+        return 0
+
+    def _store(self, key, res):
+        """Put a resource into the cache, unloading others if over budget."""
+        self._discard(key)
+        size = self._sizes[key] = self._sizeof(res)
+        self._cache[key] = res
+        self._bytes += size
+        if self._max_bytes is not None and self._bytes > self._max_bytes:
+            self._evict(key)
+
+    def _discard(self, key):
+        res = self._cache.pop(key, None)
+        if res is not None:
+            self._bytes -= self._sizes.pop(key)
+        return res
+
+    def _evict(self, keep):
+        """Unload least recently used resources until within max_bytes."""
+        for key in list(self._cache):
+            if self._bytes <= self._max_bytes:
+                break
+            if key == keep or key in self._pinned or self._users.get(key):
+                continue
+            res = self._discard(key)
+            name = key[0]
+            if self.__dict__.get(name) is res:
+                # The attribute set by __getattr__()
+                del self.__dict__[name]
+            try:
+                self._evicted[key] = res
+            except TypeError:
+                # Not all resources can be weakly referenced
+                pass
+            self._evictions += 1
+
+    def pin(self, name, *args, **kwargs):
+        """Load a resource, and never unload it to stay within max_bytes."""
+        res = self.load(name, *args, **kwargs)
+        self._pinned.add(self.cache_key(name, args, kwargs))
+        return res
+
+    def unpin(self, name, *args, **kwargs):
+        """Allow a pinned resource to be unloaded again."""
+        self._pinned.discard(self.cache_key(name, args, kwargs))
+
+    def _use(self, name, actor):
+        """Load a resource for actor, and keep it loaded while actor uses it."""
+        res = self.load(name)
+        key = self.cache_key(name, (), {})
+        users = self._users.get(key)
+        if users is None:
+            users = self._users[key] = weakref.WeakSet()
+        users.add(actor)
         return res
 
+    def _release(self, name, actor):
+        """Stop keeping a resource loaded for actor."""
+        key = self.cache_key(name, (), {})
+        users = self._users.get(key)
+        if users is not None:
+            users.discard(actor)
+            if not users:
+                del self._users[key]
+
+    def stats(self):
+        """Get statistics about the cache, as a dict."""
+        return {
+            'count': len(self._cache),
+            'bytes': self._bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+        }
+
+    def _decode(self, path):
+        """Load a resource in a background thread.
+
+        The result is passed to _finish() on the main thread.
+
+        """
+        return self._load(path)
+
+    def _finish(self, decoded):
+        return decoded
+
+    def _preload_items(self, names=None):
+        """Start decoding the named resources in the background.
+
+        Return a list of (loader, key, future) for resources that are not
+        yet loaded, and the number that are already loaded.
+
+        """
+        if names is None:
+            names = self._names()
+        items = []
+        done = 0
+        for name in names:
+            key = self.cache_key(name, (), {})
+            if key in self._cache:
+                done += 1
+                continue
+            future = self._pending.get(key)
+            if future is None:
+                path = self._find(name)
+                future = _get_executor().submit(self._decode, path)
+                self._pending[key] = future
+            items.append((self, key, future))
+        return items, done
+
+    def _finish_pending(self, key, future):
+        """Put a resource decoded in the background into the cache."""
+        if self._pending.get(key) is future:
+            del self._pending[key]
+            try:
+                res = self._finish(future.result())
+            except Exception as e:
+                self._failed[key] = e
+                raise
+            self._store(key, res)
+
+    def preload(self, names=None):
+        """Start loading resources in the background.
+
+        :param names: The names of the resources to load. If not given, load
+                      all of the resources in the directory.
+        :return: A Preload object giving the progress of the loading.
+
+        """
+        return Preload(*self._preload_items(names))
+
     def unload(self, name, *args, **kwargs):
         key = self.cache_key(name, args, kwargs)
-        if key in self._cache:
-            del self._cache[key]
+        self._discard(key)
+        self._evicted.pop(key, None)
+        self._pending.pop(key, None)
+        self._failed.pop(key, None)
 
     def unload_all(self):
         self._cache.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._evicted.clear()
+        self._pending.clear()
+        self._failed.clear()
 
     def __getattr__(self, name):
-        p = os.path.join(self._root(), name)
-        if os.path.isdir(p):
+        index = self._get_index()
+        if name in self._index_dirs or (
+            name not in index
+            and os.path.isdir(os.path.join(self._root(), name))
+        ):
             resource = self.__class__(os.path.join(self._subpath, name))
         else:
             try:
@@ -161,22 +422,103 @@ class ResourceLoader:
         setattr(self, name, resource)
         return resource
 
+    def _names(self):
+        """Get the names of the loadable resources in the directory."""
+        if not os.path.isdir(self._root()):
+            raise FileNotFoundError(
+                "No '{}' directory found.".format(self._subpath)
+            )
+        return [
+            name for name, path in self._get_index().items()
+            if name.isidentifier()
+            and os.path.splitext(path)[1][1:] in self.EXTNS
+        ]
+
     def __dir__(self):
         standard_attributes = [key for key in self.__dict__.keys()
                                if not key.startswith("_")]
-        resources = os.listdir(self._root())
-        resource_names = [os.path.splitext(r) for r in resources]
-        loadable_names = [name for name, ext in resource_names
-                          if name.isidentifier() and ext[1:] in self.EXTNS]
-        return standard_attributes + loadable_names
+        return standard_attributes + self._names()
 
 
 class ImageLoader(ResourceLoader):
     EXTNS = ['png', 'gif', 'jpg', 'jpeg', 'bmp', 'webp']
     TYPE = 'image'
 
+    # The ImageCache of decoded images, if enabled
+    _disk_cache = None
+
+    def enable_disk_cache(self, directory=None):
+        """Keep decoded images on disk, to load them faster next time.
+
+        :param directory: The directory for the cache. By default, this is
+                          in the same configuration directory as storage.
+
+        """
+        from .imagecache import ImageCache
+        self._disk_cache = ImageCache(directory)
+        return self._disk_cache
+
     def _load(self, path):
-        return pygame.image.load(path).convert_alpha()
+        return self._finish(self._decode(path))
+
+    def _decode(self, path):
+        """Decode an image, returning (surface, path to cache it under)."""
+        cache = self._disk_cache
+        if cache is not None:
+            surf = cache.load(path)
+            if surf is not None:
+                return surf, None
+        # Pygame releases the GIL while decoding, so this can run in threads
+        return pygame.image.load(path), path
+
+    def _finish(self, decoded):
+        surf, path = decoded
+        surf = surf.convert_alpha()
+        if path is not None and self._disk_cache is not None:
+            self._disk_cache.save(path, surf)
+        return surf
+
+    def _sizeof(self, surf):
+        w, h = surf.get_size()
+        return surf.get_bytesize() * w * h
+
+    def build_atlas(self, subdir=None, page_size=1024, layout=None):
+        """Pack images into a few large surfaces.
+
+        Afterwards, loading one of the packed images returns a subsurface of
+        the atlas, which shares its pixels. Packed images are pinned, so they
+        are not unloaded to stay within max_bytes.
+
+        :param subdir: Pack only the images in this subdirectory (which are
+                       loaded with names like 'subdir/name').
+        :param page_size: The width and height of each atlas surface.
+        :param layout: The name of a file in which to save the positions of
+                       the images, so that later runs don't need to pack
+                       them again.
+        :return: The Atlas.
+
+        """
+        from .atlas import Atlas
+
+        prefix = subdir.strip('/') + '/' if subdir else ''
+        names = [
+            name for name, path in self._get_index().items()
+            if name.startswith(prefix)
+            and (subdir or '/' not in name)
+            and os.path.splitext(name)[0] == name
+            and os.path.splitext(path)[1][1:] in self.EXTNS
+        ]
+        paths = [self._find(name) for name in names]
+        surfs = map(self._finish, _get_executor().map(self._decode, paths))
+        if layout:
+            layout = os.path.join(self._root(), layout)
+        atlas = Atlas.build(dict(zip(names, surfs)), page_size, layout)
+        for name in atlas.regions:
+            key = self.cache_key(name, (), {})
+            self._pending.pop(key, None)
+            self._store(key, atlas.subsurface(name))
+            self._pinned.add(key)
+        return atlas
 
     def __repr__(self):
         return "<Images images={}>".format(self.__dir__())
@@ -190,6 +532,12 @@ class SoundLoader(ResourceLoader):
     EXTNS = ['wav', 'ogg', 'oga']
     TYPE = 'sound'
 
+    def _sizeof(self, sound):
+        # The same as len(sound.get_raw()), without copying the samples
+        freq, fmt, channels = pygame.mixer.get_init()
+        bytes_per_sample = (abs(fmt) & 0xff) // 8
+        return round(sound.get_length() * freq * channels * bytes_per_sample)
+
     def _load(self, path):
         try:
             return pygame.mixer.Sound(path)
@@ -241,6 +589,126 @@ sounds = SoundLoader('sounds')
 fonts = FontLoader('fonts')
 
 
+# The number of threads used to decode resources in the background
+PRELOAD_THREADS = min(4, os.cpu_count() or 1)
+
+# The most time (in seconds) to spend per frame finishing preloaded resources
+PRELOAD_FINISH_TIME = 0.005
+
+_executor = None
+
+# Preloads in progress. These are kept alive so that they continue to finish
+# resources even if the game doesn't keep a reference to them.
+_active_preloads = set()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=PRELOAD_THREADS,
+            thread_name_prefix='pgzero-preload',
+        )
+    return _executor
+
+
+class Preload:
+    """The progress of resources being loaded in the background.
+
+    Files are decoded in a pool of threads. Each frame, the resources that
+    have been decoded are finished on the main thread (images are converted
+    for fast drawing) and put into their loader's cache.
+
+    """
+
+    def __init__(self, items, done=0):
+        self._items = list(items)
+        self.total = len(self._items) + done
+        self.done = done
+        # (name, exception) for resources that could not be loaded
+        self.failed = []
+        self._tick = None
+        if self._items:
+            _active_preloads.add(self)
+            self._tick = clock.each_tick(self.update)
+
+    def __repr__(self):
+        return '<Preload {}/{}>'.format(self.done, self.total)
+
+    @property
+    def progress(self):
+        """Get the fraction of the resources that have been loaded."""
+        if not self.total:
+            return 1.0
+        return self.done / self.total
+
+    @property
+    def finished(self):
+        """Return True if all of the resources have been loaded."""
+        return not self._items
+
+    def update(self, dt=None):
+        """Finish any resources that have been decoded.
+
+        This is called every frame, spending at most PRELOAD_FINISH_TIME.
+
+        """
+        items = self._items
+        start = perf_counter()
+        i = 0
+        while i < len(items):
+            loader, key, future = items[i]
+            if not future.done():
+                i += 1
+                continue
+            del items[i]
+            self.done += 1
+            self._finish_item(loader, key, future)
+            if perf_counter() - start > PRELOAD_FINISH_TIME:
+                break
+        if not items:
+            self._stop()
+
+    def wait(self):
+        """Block until all of the resources have been loaded."""
+        items = self._items
+        while items:
+            loader, key, future = items.pop(0)
+            self.done += 1
+            self._finish_item(loader, key, future)
+        self._stop()
+
+    def _finish_item(self, loader, key, future):
+        try:
+            loader._finish_pending(key, future)
+        except Exception as e:
+            # Carry on with the other resources; loading this one again
+            # raises the error
+            self.failed.append((key[0], e))
+
+    def _stop(self):
+        if self._tick is not None:
+            self._tick.cancel()
+            self._tick = None
+        _active_preloads.discard(self)
+
+
+def preload_all():
+    """Start loading all images and sounds in the background.
+
+    Return a Preload object giving the progress of the loading.
+
+    """
+    items = []
+    done = 0
+    for loader in (images, sounds):
+        if os.path.isdir(loader._root()):
+            loader_items, loader_done = loader._preload_items()
+            items.extend(loader_items)
+            done += loader_done
+    return Preload(items, done)
+
+
 def getfont(
         fontname=None,
         fontsize=None,
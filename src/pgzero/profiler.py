@@ -0,0 +1,123 @@
+"""Timing of the phases of the game loop, for finding slow frames.
+
+The game loop marks the end of each phase of a frame (handling events,
+ticking the clock, update(), draw() and flipping the display). The profiler
+keeps a history of recent frames to report percentiles, and can optionally
+write a JSON record for every frame to a file.
+
+"""
+import json
+from collections import deque
+from math import ceil
+from time import perf_counter
+
+
+__all__ = ['PHASES', 'FrameProfiler', 'percentile']
+
+
+# The phases of a frame, in order
+PHASES = ('events', 'clock', 'update', 'draw', 'flip')
+
+
+def percentile(values, p):
+    """Get the p-th percentile of a sorted sequence, by nearest rank."""
+    if not values:
+        return 0.0
+    rank = ceil(p / 100 * len(values)) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
+
+
+class FrameProfiler:
+    """Record the time spent in each phase of each frame.
+
+    :param history: The number of recent frames to keep for statistics.
+    :param out: A path to which to write a JSON line for every frame.
+
+    """
+
+    def __init__(self, history=600, out=None):
+        self.times = {
+            phase: deque(maxlen=history) for phase in PHASES + ('total',)
+        }
+        self.dts = deque(maxlen=history)
+        self.frame = dict.fromkeys(PHASES, 0.0)
+        self.count = 0
+        self.out_path = out
+        self._out = None
+        self._t0 = self._start = self._last = perf_counter()
+
+    def start_frame(self):
+        """Mark the start of a frame."""
+        self._start = self._last = perf_counter()
+        frame = self.frame
+        for phase in PHASES:
+            frame[phase] = 0.0
+
+    def mark(self, phase):
+        """Attribute the time since the last mark to the given phase."""
+        now = perf_counter()
+        self.frame[phase] += (now - self._last) * 1e3
+        self._last = now
+
+    def end_frame(self, dt):
+        """Mark the end of a frame, which was given dt seconds of game time."""
+        total = (self._last - self._start) * 1e3
+        times = self.times
+        for phase, t in self.frame.items():
+            times[phase].append(t)
+        times['total'].append(total)
+        self.dts.append(dt)
+        self.count += 1
+
+        if self.out_path:
+            if self._out is None:
+                self._out = open(self.out_path, 'w', encoding='utf8')
+            record = {
+                'frame': self.count,
+                't': round(self._start - self._t0, 6),
+                'dt': round(dt * 1e3, 3),
+                'total': round(total, 3),
+            }
+            for phase, t in self.frame.items():
+                record[phase] = round(t, 3)
+            self._out.write(json.dumps(record) + '\n')
+
+    def close(self):
+        """Close the output file, if any."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def fps(self):
+        """Get the mean frames per second over the recorded history."""
+        elapsed = sum(self.dts)
+        return len(self.dts) / elapsed if elapsed else 0.0
+
+    def stats(self, phase='total'):
+        """Get statistics (in ms) for a phase over the recorded history.
+
+        Return a dict with keys 'mean', 'p50', 'p95', 'p99' and 'worst'.
+
+        """
+        values = sorted(self.times[phase])
+        if not values:
+            return dict.fromkeys(('mean', 'p50', 'p95', 'p99', 'worst'), 0.0)
+        return {
+            'mean': sum(values) / len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99),
+            'worst': values[-1],
+        }
+
+    def summary(self):
+        """Get a human-readable summary of recent frame times."""
+        total = self.stats()
+        phases = '  '.join(
+            f"{phase} {self.stats(phase)['mean']:0.1f}ms" for phase in PHASES
+        )
+        return (
+            f"fps: {self.fps():0.1f}  time per frame: {total['mean']:0.1f}ms "
+            f"(p95 {total['p95']:0.1f}ms, worst {total['worst']:0.1f}ms)\n"
+            f"    {phases}"
+        )
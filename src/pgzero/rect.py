@@ -2,6 +2,8 @@
 import pygame.rect
 import operator
 
+import numpy as np
+
 
 class Rect(pygame.rect.Rect):
     __slots__ = ()
@@ -36,6 +38,64 @@ class NoIntersect(Exception):
     pass
 
 
+def _handle_one_arg(arg):
+    """Handle -- possibly recursively -- the case of one parameter
+
+    Pygame -- and consequently pgzero -- is very accommodating when constructing
+    a rect. You can pass four integers, two pairs of 2-tuples, or one 4-tuple.
+
+    Also, you can pass an existing Rect-like object, or an object with a .rect
+    attribute. The object named by the .rect attribute is either one of the above,
+    or it's a callable object which returns one of the above.
+
+    This is evidently a recursive solution where an object with a .rect
+    attribute can yield an object with a .rect attribute, and so ad infinitum.
+    """
+    #
+    # If the arg is an existing rect, return its elements
+    #
+    if isinstance(arg, RECT_CLASSES):
+        return arg.x, arg.y, arg.w, arg.h
+
+    #
+    # If it's something with a .rect attribute, start again with
+    # that attribute, calling it first if it's callable
+    #
+    if hasattr(arg, "rect"):
+        rectobj = arg.rect
+        if callable(rectobj):
+            rectobj = rectobj()
+        return _handle_one_arg(rectobj)
+
+    #
+    # Otherwise, we assume it's an iterable of four elements
+    #
+    return arg
+
+
+def _xywh(args):
+    """Get a tuple (x, y, w, h) from the arguments accepted by ZRect().
+
+    This allows methods to take rects in all the same forms as the
+    constructor, without constructing a new ZRect.
+
+    """
+    if len(args) == 1:
+        arg = args[0]
+        if isinstance(arg, RECT_CLASSES):
+            return arg.x, arg.y, arg.w, arg.h
+        args = tuple(_handle_one_arg(arg))
+    if len(args) == 4:
+        return args
+    elif len(args) == 2:
+        (x, y), (w, h) = args
+        return x, y, w, h
+    elif len(args) == 1:
+        x, y, w, h = args[0]
+        return x, y, w, h
+    raise TypeError("ZRect should be called with one, two or four arguments")
+
+
 class ZRect:
     """ZRect
 
@@ -50,9 +110,22 @@ class ZRect:
     an (optionally callable) .rect attribute whose value will be used instead.
     """
 
+    __slots__ = ('x', 'y', 'w', 'h')
+
     _item_mapping = dict(enumerate("xywh"))
 
     def __init__(self, *args):
+        # Fast paths for the most common cases
+        if len(args) == 4:
+            self.x, self.y, self.w, self.h = args
+            return
+        if len(args) == 1 and isinstance(args[0], RECT_CLASSES):
+            r = args[0]
+            self.x = r.x
+            self.y = r.y
+            self.w = r.w
+            self.h = r.h
+            return
 
         if len(args) == 1:
             args = tuple(self._handle_one_arg(args[0]))
@@ -76,41 +149,13 @@ class ZRect:
                 % (self.__class__.__name__)
             )
 
-        self.rect = self
+    @property
+    def rect(self):
+        """The rect itself, so that ZRects are accepted by Pygame functions."""
+        return self
 
     def _handle_one_arg(self, arg):
-        """Handle -- possibly recursively -- the case of one parameter
-
-        Pygame -- and consequently pgzero -- is very accommodating when constructing
-        a rect. You can pass four integers, two pairs of 2-tuples, or one 4-tuple.
-
-        Also, you can pass an existing Rect-like object, or an object with a .rect
-        attribute. The object named by the .rect attribute is either one of the above,
-        or it's a callable object which returns one of the above.
-
-        This is evidently a recursive solution where an object with a .rect
-        attribute can yield an object with a .rect attribute, and so ad infinitum.
-        """
-        #
-        # If the arg is an existing rect, return its elements
-        #
-        if isinstance(arg, RECT_CLASSES):
-            return arg.x, arg.y, arg.w, arg.h
-
-        #
-        # If it's something with a .rect attribute, start again with
-        # that attribute, calling it first if it's callable
-        #
-        if hasattr(arg, "rect"):
-            rectobj = arg.rect
-            if callable(rectobj):
-                rectobj = rectobj()
-            return self._handle_one_arg(rectobj)
-
-        #
-        # Otherwise, we assume it's an iterable of four elements
-        #
-        return arg
+        return _handle_one_arg(arg)
 
     def __repr__(self):
         return "<%s (x: %s, y: %s, w: %s, h: %s)>" % (
@@ -138,7 +183,7 @@ class ZRect:
         except KeyError:
             raise IndexError
         else:
-            setattr(attribute, value)
+            setattr(self, attribute, value)
 
     def __bool__(self):
         return self.w != 0 and self.h != 0
@@ -153,28 +198,22 @@ class ZRect:
         raise TypeError("ZRect instances may not be used as dictionary keys")
 
     def __eq__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) == (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) == tuple(_xywh(other))
 
     def __ne__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) != (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) != tuple(_xywh(other))
 
     def __lt__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) < (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) < tuple(_xywh(other))
 
     def __gt__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) > (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) > tuple(_xywh(other))
 
     def __le__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) <= (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) <= tuple(_xywh(other))
 
     def __ge__(self, *other):
-        rect = self.__class__(*other)
-        return (self.x, self.y, self.w, self.h) >= (rect.x, rect.y, rect.w, rect.h)
+        return (self.x, self.y, self.w, self.h) >= tuple(_xywh(other))
 
     def __contains__(self, other):
         """Test whether a point (x, y) or another rectangle
@@ -343,109 +382,103 @@ class ZRect:
     def inflate_ip(self, x, y):
         self.x, self.y, self.w, self.h = self._inflated(x, y)
 
-    def _clamped(self, *other):
-        rect = self.__class__(*other)
-
-        if self.w >= rect.w:
-            x = rect.x + rect.w / 2 - self.w / 2
-        elif self.x < rect.x:
-            x = rect.x
-        elif self.x + self.w > rect.x + rect.w:
-            x = rect.x + rect.w - self.w
+    def _clamped(self, rx, ry, rw, rh):
+        if self.w >= rw:
+            x = rx + rw / 2 - self.w / 2
+        elif self.x < rx:
+            x = rx
+        elif self.x + self.w > rx + rw:
+            x = rx + rw - self.w
         else:
             x = self.x
 
-        if self.h >= rect.h:
-            y = rect.y + rect.h / 2 - self.h / 2
-        elif self.y < rect.y:
-            y = rect.y
-        elif self.y + self.h > rect.y + rect.h:
-            y = rect.y + rect.h - self.h
+        if self.h >= rh:
+            y = ry + rh / 2 - self.h / 2
+        elif self.y < ry:
+            y = ry
+        elif self.y + self.h > ry + rh:
+            y = ry + rh - self.h
         else:
             y = self.y
 
         return x, y
 
     def clamp(self, *other):
-        rect = self.__class__(*other)
-        x, y = self._clamped(rect)
+        x, y = self._clamped(*_xywh(other))
         return self.__class__(x, y, self.w, self.h)
 
     def clamp_ip(self, *other):
-        rect = self.__class__(*other)
-        self.x, self.y = self._clamped(rect)
-
-    def _clipped(self, *other):
-        rect = self.__class__(*other)
+        self.x, self.y = self._clamped(*_xywh(other))
 
-        if self.x >= rect.x and self.x < (rect.x + rect.w):
+    def _clipped(self, rx, ry, rw, rh):
+        if self.x >= rx and self.x < (rx + rw):
             x = self.x
-        elif rect.x >= self.x and rect.x < (self.x + self.w):
-            x = rect.x
+        elif rx >= self.x and rx < (self.x + self.w):
+            x = rx
         else:
             raise NoIntersect
 
-        if (self.x + self.w) > rect.x and (self.x + self.w) <= (rect.x + rect.w):
+        if (self.x + self.w) > rx and (self.x + self.w) <= (rx + rw):
             w = self.x + self.w - x
-        elif (rect.x + rect.w) > self.x and (rect.x + rect.w) <= (self.x + self.w):
-            w = rect.x + rect.w - x
+        elif (rx + rw) > self.x and (rx + rw) <= (self.x + self.w):
+            w = rx + rw - x
         else:
             raise NoIntersect
 
-        if self.y >= rect.y and self.y < (rect.y + rect.h):
+        if self.y >= ry and self.y < (ry + rh):
             y = self.y
-        elif rect.y >= self.y and rect.y < (self.y + self.h):
-            y = rect.y
+        elif ry >= self.y and ry < (self.y + self.h):
+            y = ry
         else:
             raise NoIntersect
 
-        if (self.y + self.h) > rect.y and (self.y + self.h) <= (rect.y + rect.h):
+        if (self.y + self.h) > ry and (self.y + self.h) <= (ry + rh):
             h = self.y + self.h - y
-        elif (rect.y + rect.h) > self.y and (rect.y + rect.h) <= (self.y + self.h):
-            h = rect.y + rect.h - y
+        elif (ry + rh) > self.y and (ry + rh) <= (self.y + self.h):
+            h = ry + rh - y
         else:
             raise NoIntersect
 
         return x, y, w, h
 
     def clip(self, *other):
-        rect = self.__class__(*other)
         try:
-            x, y, w, h = self._clipped(rect)
+            x, y, w, h = self._clipped(*_xywh(other))
         except NoIntersect:
             x, y, w, h = self.x, self.y, 0, 0
         return self.__class__(x, y, w, h)
 
     def clip_ip(self, *other):
-        rect = self.__class__(*other)
         try:
-            self.x, self.y, self.w, self.h = self._clipped(rect)
+            self.x, self.y, self.w, self.h = self._clipped(*_xywh(other))
         except NoIntersect:
             self.x, self.y, self.w, self.h = self.x, self.y, 0, 0
 
-    def _unioned(self, *other):
-        rect = self.__class__(*other)
-        x = min(self.x, rect.x)
-        y = min(self.y, rect.y)
-        w = max(self.x + self.w, rect.x + rect.w) - x
-        h = max(self.y + self.h, rect.y + rect.h) - y
+    def _unioned(self, rx, ry, rw, rh):
+        x = min(self.x, rx)
+        y = min(self.y, ry)
+        w = max(self.x + self.w, rx + rw) - x
+        h = max(self.y + self.h, ry + rh) - y
         return x, y, w, h
 
     def union(self, *other):
-        rect = self.__class__(*other)
-        return self.__class__(*self._unioned(rect))
+        return self.__class__(*self._unioned(*_xywh(other)))
 
     def union_ip(self, *other):
-        rect = self.__class__(*other)
-        self.x, self.y, self.w, self.h = self._unioned(rect)
+        self.x, self.y, self.w, self.h = self._unioned(*_xywh(other))
 
     def _unionalled(self, others):
-        allrects = [self] + [self.__class__(other) for other in others]
-        x = min(r.x for r in allrects)
-        y = min(r.y for r in allrects)
-        w = max(r.x + r.w for r in allrects) - x
-        h = max(r.y + r.h for r in allrects) - y
-        return x, y, w, h
+        x1 = self.x
+        y1 = self.y
+        x2 = self.x + self.w
+        y2 = self.y + self.h
+        for other in others:
+            x, y, w, h = _xywh((other,))
+            x1 = min(x1, x)
+            y1 = min(y1, y)
+            x2 = max(x2, x + w)
+            y2 = max(y2, y + h)
+        return x1, y1, x2 - x1, y2 - y1
 
     def unionall(self, others):
         return self.__class__(*self._unionalled(others))
@@ -454,12 +487,12 @@ class ZRect:
         self.x, self.y, self.w, self.h = self._unionalled(others)
 
     def fit(self, *other):
-        rect = self.__class__(*other)
-        ratio = max(self.w / rect.w, self.h / rect.h)
+        rx, ry, rw, rh = _xywh(other)
+        ratio = max(self.w / rw, self.h / rh)
         w = self.w / ratio
         h = self.h / ratio
-        x = rect.x + (rect.w - w) / 2
-        y = rect.y + (rect.h - h) / 2
+        x = rx + (rw - w) / 2
+        y = ry + (rh - h) / 2
         return self.__class__(x, y, w, h)
 
     def normalize(self):
@@ -471,14 +504,14 @@ class ZRect:
             self.h = abs(self.h)
 
     def contains(self, *other):
-        rect = self.__class__(*other)
+        x, y, w, h = _xywh(other)
         return (
-            self.x <= rect.x and
-            self.y <= rect.y and
-            self.x + self.w >= rect.x + rect.w and
-            self.y + self.h >= rect.y + rect.h and
-            self.x + self.w > rect.x and
-            self.y + self.h > rect.y
+            self.x <= x and
+            self.y <= y and
+            self.x + self.w >= x + w and
+            self.y + self.h >= y + h and
+            self.x + self.w > x and
+            self.y + self.h > y
         )
 
     def collidepoint(self, *args):
@@ -492,15 +525,17 @@ class ZRect:
         )
 
     def colliderect(self, *other):
-        rect = self.__class__(*other)
+        x, y, w, h = _xywh(other)
         return (
-            self.x < rect.x + rect.w and
-            self.y < rect.y + rect.h and
-            self.x + self.w > rect.x and
-            self.y + self.h > rect.y
+            self.x < x + w and
+            self.y < y + h and
+            self.x + self.w > x and
+            self.y + self.h > y
         )
 
     def collidelist(self, others):
+        if isinstance(others, RectArray):
+            return others.collidelist(self)
         for n, other in enumerate(others):
             if self.colliderect(other):
                 return n
@@ -508,6 +543,8 @@ class ZRect:
             return -1
 
     def collidelistall(self, others):
+        if isinstance(others, RectArray):
+            return others.collidelistall(self)
         return [n for n, other in enumerate(others) if self.colliderect(other)]
 
     def collidedict(self, dict, use_values=True):
@@ -521,3 +558,226 @@ class ZRect:
 
 
 RECT_CLASSES = (pygame.rect.Rect, ZRect)
+
+
+# The number of elements of the collision matrix to compute at once in
+# RectArray.collide_pairs()
+PAIRS_CHUNK_SIZE = 1 << 20
+
+
+def _rect_columns(rects):
+    """Get a list of (x, y, w, h) tuples from an iterable of rect-like objects.
+
+    Actors are read directly from their rect rather than copying it.
+
+    """
+    columns = []
+    append = columns.append
+    for r in rects:
+        r = getattr(r, '_rect', r)
+        if isinstance(r, RECT_CLASSES):
+            append((r.x, r.y, r.w, r.h))
+        else:
+            append(_xywh((r,)))
+    return columns
+
+
+class RectArray:
+    """An array of rectangles, stored as NumPy columns x, y, w and h.
+
+    Methods test or transform all of the rects at once, which is much faster
+    than looping over a list of Rects or Actors in Python. Tests return
+    boolean NumPy arrays, which can be turned into indexes into the original
+    list with ``.nonzero()``.
+
+    :param rects: An iterable of Rects, Actors or anything else that can be
+                  passed to ZRect().
+
+    """
+    __slots__ = ('_cols',)
+
+    def __init__(self, rects=()):
+        columns = _rect_columns(rects)
+        self._cols = np.array(columns, dtype=float).reshape(-1, 4).T.copy()
+
+    @classmethod
+    def from_columns(cls, x, y, w, h):
+        """Construct a RectArray from sequences of x, y, w and h values."""
+        ra = cls.__new__(cls)
+        ra._cols = np.array([x, y, w, h], dtype=float).reshape(4, -1)
+        return ra
+
+    @property
+    def x(self):
+        return self._cols[0]
+
+    @property
+    def y(self):
+        return self._cols[1]
+
+    @property
+    def w(self):
+        return self._cols[2]
+
+    @property
+    def h(self):
+        return self._cols[3]
+
+    @property
+    def right(self):
+        return self._cols[0] + self._cols[2]
+
+    @property
+    def bottom(self):
+        return self._cols[1] + self._cols[3]
+
+    @property
+    def centerx(self):
+        return self._cols[0] + self._cols[2] / 2
+
+    @property
+    def centery(self):
+        return self._cols[1] + self._cols[3] / 2
+
+    def __len__(self):
+        return self._cols.shape[1]
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return ZRect(*self._cols[:, index].tolist())
+        return self.from_columns(*self._cols[:, index])
+
+    def __iter__(self):
+        for x, y, w, h in self._cols.T.tolist():
+            yield ZRect(x, y, w, h)
+
+    def __repr__(self):
+        return "<{} of {} rects>".format(type(self).__name__, len(self))
+
+    def copy(self):
+        return self.from_columns(*self._cols)
+
+    def move(self, x, y):
+        """Get a RectArray with every rect moved by (x, y).
+
+        x and y may be numbers, or arrays giving a distance for each rect.
+
+        """
+        ra = self.copy()
+        ra.move_ip(x, y)
+        return ra
+
+    def move_ip(self, x, y):
+        self._cols[0] += x
+        self._cols[1] += y
+
+    def collidepoint(self, *args):
+        """Get a boolean array of the rects that contain a point."""
+        if len(args) == 1:
+            x, y = args[0]
+        else:
+            x, y = args
+        rx, ry, rw, rh = self._cols
+        return (rx <= x) & (x < rx + rw) & (ry <= y) & (y < ry + rh)
+
+    def colliderect(self, *other):
+        """Get a boolean array of the rects that overlap another rect."""
+        x, y, w, h = _xywh(other)
+        rx, ry, rw, rh = self._cols
+        return (rx < x + w) & (ry < y + h) & (rx + rw > x) & (ry + rh > y)
+
+    def collidelist(self, *other):
+        """Get the index of the first rect that overlaps another, or -1."""
+        hits = self.colliderect(*other).nonzero()[0]
+        return int(hits[0]) if len(hits) else -1
+
+    def collidelistall(self, *other):
+        """Get a list of the indexes of the rects that overlap another."""
+        return self.colliderect(*other).nonzero()[0].tolist()
+
+    def clip(self, *other):
+        """Get a RectArray of each rect cropped to lie inside another rect.
+
+        Rects that don't overlap become zero-sized, as with ZRect.clip().
+
+        """
+        x, y, w, h = _xywh(other)
+        rx, ry, rw, rh = self._cols
+        x1 = np.maximum(rx, x)
+        y1 = np.maximum(ry, y)
+        x2 = np.minimum(rx + rw, x + w)
+        y2 = np.minimum(ry + rh, y + h)
+        hit = (x1 < x2) & (y1 < y2)
+        return self.from_columns(
+            np.where(hit, x1, rx),
+            np.where(hit, y1, ry),
+            np.where(hit, x2 - x1, 0),
+            np.where(hit, y2 - y1, 0),
+        )
+
+    def union(self, *other):
+        """Get a RectArray of each rect enlarged to also cover another rect."""
+        x, y, w, h = _xywh(other)
+        rx, ry, rw, rh = self._cols
+        x1 = np.minimum(rx, x)
+        y1 = np.minimum(ry, y)
+        return self.from_columns(
+            x1,
+            y1,
+            np.maximum(rx + rw, x + w) - x1,
+            np.maximum(ry + rh, y + h) - y1,
+        )
+
+    def unionall(self):
+        """Get a ZRect covering all of the rects."""
+        if not len(self):
+            raise ValueError("unionall() of an empty RectArray")
+        x = self.x.min()
+        y = self.y.min()
+        return ZRect(
+            float(x), float(y),
+            float(self.right.max() - x), float(self.bottom.max() - y),
+        )
+
+    def collide_matrix(self, other):
+        """Get a 2D boolean array of which rects overlap the rects in other.
+
+        Element [i, j] is True if self[i] overlaps other[j].
+
+        """
+        if not isinstance(other, RectArray):
+            other = RectArray(other)
+        rx, ry, rw, rh = self._cols[:, :, np.newaxis]
+        ox, oy, ow, oh = other._cols[:, np.newaxis, :]
+        return (rx < ox + ow) & (ry < oy + oh) & (rx + rw > ox) & (ry + rh > oy)
+
+    def collide_pairs(self, other=None):
+        """Find all pairs of overlapping rects.
+
+        Return two arrays of indexes ``i, j`` such that ``self[i[k]]``
+        overlaps ``other[j[k]]``. If other is not given, find the pairs of
+        rects in this array that overlap each other, each pair once.
+
+        The rects are tested in chunks so that memory use stays bounded for
+        large arrays.
+
+        """
+        same = other is None
+        if same:
+            other = self
+        elif not isinstance(other, RectArray):
+            other = RectArray(other)
+        n = len(self)
+        chunk = max(1, PAIRS_CHUNK_SIZE // max(len(other), 1))
+        found_i = []
+        found_j = []
+        for start in range(0, n, chunk):
+            matrix = self[start:start + chunk].collide_matrix(other)
+            if same:
+                matrix = np.triu(matrix, k=start + 1)
+            i, j = matrix.nonzero()
+            found_i.append(i + start)
+            found_j.append(j)
+        if not found_i:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(found_i), np.concatenate(found_j)
@@ -5,6 +5,8 @@ from . import __version__
 from .game import PGZeroGame, DISPLAY_FLAGS
 from types import ModuleType
 from argparse import ArgumentParser
+import json
+import random
 import warnings
 import sys
 import os
@@ -69,6 +71,51 @@ def main():
         action='store_true',
         help="Print periodic FPS measurements on the terminal."
     )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Show frame timings at the bottom left of the window."
+    )
+    parser.add_argument(
+        '--profile-out',
+        metavar='FILE',
+        help="Write timings for every frame to FILE, as JSON lines."
+    )
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument(
+        '--max-fps',
+        type=float,
+        metavar='FPS',
+        help="The frame rate to run at, overriding the game's FPS setting."
+    )
+    rate.add_argument(
+        '--uncapped',
+        action='store_true',
+        help="Run as many frames per second as possible."
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help="Run without a window or sound, as fast as possible, with a "
+             "fixed time step, and report timings at the end. Requires "
+             "--frames."
+    )
+    parser.add_argument(
+        '--frames',
+        type=int,
+        metavar='N',
+        help="Exit after running N frames."
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help="Seed the random number generator before starting the game."
+    )
+    parser.add_argument(
+        '--input',
+        metavar='FILE',
+        help="Replay input events from FILE, a JSON lines file."
+    )
     parser.add_argument(
         '--version',
         action='version',
@@ -79,21 +126,94 @@ def main():
         help="The Pygame Zero game to run (a Python file or directory)."
     )
     args = parser.parse_args()
+    if args.headless and args.frames is None:
+        # Nothing could stop the game, which has no window to close
+        parser.error("--headless requires --frames")
 
     if __debug__:
         warnings.simplefilter('default', DeprecationWarning)
 
+    if args.headless:
+        use_dummy_drivers()
+
     try:
-        load_and_run(args.game, fps=args.fps)
-    except NoMainModule as e:
+        input_events = args.input and load_input_script(args.input)
+        load_and_run(
+            args.game,
+            seed=args.seed,
+            fps=args.fps,
+            max_fps=0 if args.uncapped else args.max_fps,
+            overlay=args.profile,
+            profile_out=args.profile_out,
+            headless=args.headless,
+            max_frames=args.frames,
+            input_events=input_events,
+        )
+    except (NoMainModule, InvalidInputScript) as e:
         sys.exit(e)
 
 
+def use_dummy_drivers():
+    """Restart Pygame with SDL's dummy video and audio drivers.
+
+    This allows running a game with no display or sound card.
+
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pygame.quit()
+    pygame.init()
+
+
+class InvalidInputScript(Exception):
+    """Indicate that an input script could not be loaded."""
+
+
+def load_input_script(path):
+    """Load a script of input events to replay.
+
+    The script is a file with one JSON object per line, giving the frame
+    number at which the event happens, the name of the Pygame event type, and
+    the event's attributes. For example::
+
+        {"frame": 60, "type": "KEYDOWN", "key": 32, "mod": 0, "unicode": " "}
+        {"frame": 65, "type": "KEYUP", "key": 32, "mod": 0}
+        {"frame": 90, "type": "MOUSEBUTTONDOWN", "pos": [100, 200], "button": 1}
+
+    Return a dict mapping frame numbers to lists of Pygame events.
+
+    """
+    events = {}
+    try:
+        with open(path, encoding='utf8') as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    attrs = json.loads(line)
+                    frame = attrs.pop('frame')
+                    event_type = getattr(pygame, attrs.pop('type'))
+                except (ValueError, KeyError, AttributeError, TypeError) as e:
+                    raise InvalidInputScript(
+                        f"Error: {path}:{lineno}: invalid input event ({e})"
+                    ) from None
+                attrs = {
+                    k: tuple(v) if isinstance(v, list) else v
+                    for k, v in attrs.items()
+                }
+                events.setdefault(frame, []).append(
+                    pygame.event.Event(event_type, attrs)
+                )
+    except FileNotFoundError:
+        raise InvalidInputScript(f"Error: {path} does not exist.")
+    return events
+
+
 class NoMainModule(Exception):
     """Indicate that we couldn't find a main module to run."""
 
 
-def load_and_run(path, *, fps: bool = False):
+def load_and_run(path, *, seed=None, **kwargs):
     """Load and run the given Python file or directory.
 
     If a file, run this as the main PGZero game module.
@@ -108,6 +228,10 @@ def load_and_run(path, *, fps: bool = False):
     Note that the 'import pgzrun' IDE mode doesn't pass through this entry
     point, as the module is already loaded.
 
+    If seed is given, seed the random module before running the game.
+
+    Other keyword arguments are passed on to PGZeroGame.
+
     """
     path = path.rstrip(os.sep)
     try:
@@ -154,13 +278,15 @@ You can also run a specific file with:
     sys._pgzrun = True
 
     prepare_mod(mod)
+    if seed is not None:
+        random.seed(seed)
     with temp_window():
         exec(code, mod.__dict__)
 
     pygame.display.init()
     PGZeroGame.show_default_icon()
     try:
-        run_mod(mod, fps=fps)
+        run_mod(mod, **kwargs)
     finally:
         # Clean some of the state we created, useful in testing
         pygame.display.quit()
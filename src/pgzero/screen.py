@@ -24,6 +24,25 @@ def make_color(arg):
     return tuple(pygame.Color(arg))
 
 
+def merge_rects(rects):
+    """Merge overlapping rects, returning a list of disjoint pygame Rects.
+
+    The merged rects cover at least the same area as the input rects.
+
+    """
+    merged = []
+    for r in rects:
+        r = pygame.Rect(r)
+        while True:
+            hits = r.collidelistall(merged)
+            if not hits:
+                break
+            for i in reversed(hits):
+                r.union_ip(merged.pop(i))
+        merged.append(r)
+    return merged
+
+
 class SurfacePainter:
     """Interface to pygame.draw that is bound to a surface."""
 
@@ -34,21 +53,30 @@ class SurfacePainter:
     def _surf(self):
         return self._screen.surface
 
+    def _mark_dirty(self, rect):
+        self._screen._mark_dirty(rect)
+
     def line(self, start, end, color, width=1):
         """Draw a line from start to end."""
         start = round_pos(start)
         end = round_pos(end)
-        pygame.draw.line(self._surf, make_color(color), start, end, width)
+        self._mark_dirty(
+            pygame.draw.line(self._surf, make_color(color), start, end, width)
+        )
 
     def circle(self, pos, radius, color, width=1):
         """Draw a circle."""
         pos = round_pos(pos)
-        pygame.draw.circle(self._surf, make_color(color), pos, radius, width)
+        self._mark_dirty(
+            pygame.draw.circle(self._surf, make_color(color), pos, radius, width)
+        )
 
     def filled_circle(self, pos, radius, color):
         """Draw a filled circle."""
         pos = round_pos(pos)
-        pygame.draw.circle(self._surf, make_color(color), pos, radius, 0)
+        self._mark_dirty(
+            pygame.draw.circle(self._surf, make_color(color), pos, radius, 0)
+        )
 
     def polygon(self, points, color):
         """Draw a polygon."""
@@ -57,7 +85,9 @@ class SurfacePainter:
         except TypeError:
             raise TypeError("screen.draw.filled_polygon() requires an iterable of points to draw") from None # noqa
         points = [round_pos(point) for point in points]
-        pygame.draw.polygon(self._surf, make_color(color), points, 1)
+        self._mark_dirty(
+            pygame.draw.polygon(self._surf, make_color(color), points, 1)
+        )
 
     def filled_polygon(self, points, color):
         """Draw a filled polygon."""
@@ -66,7 +96,9 @@ class SurfacePainter:
         except TypeError:
             raise TypeError("screen.draw.filled_polygon() requires an iterable of points to draw") from None # noqa
         points = [round_pos(point) for point in points]
-        pygame.draw.polygon(self._surf, make_color(color), points, 0)
+        self._mark_dirty(
+            pygame.draw.polygon(self._surf, make_color(color), points, 0)
+        )
 
     def rect(self, rect, color, width=1):
         """Draw a rectangle."""
@@ -74,7 +106,9 @@ class SurfacePainter:
             raise TypeError("screen.draw.rect() requires a rect to draw")
 
         if width <= 1:
-            pygame.draw.rect(self._surf, make_color(color), rect, width)
+            self._mark_dirty(
+                pygame.draw.rect(self._surf, make_color(color), rect, width)
+            )
             return
 
         c = make_color(color)
@@ -94,22 +128,27 @@ class SurfacePainter:
         r(l1, t2, l2, b1)  # left exclusive
         r(r1, t2, r2, b1)  # right exclusive
         r(l1, b1, r2, b2)  # bottom inclusive
+        self._mark_dirty(pygame.Rect(l1, t1, r2 - l1, b2 - t1))
 
     def filled_rect(self, rect, color):
         """Draw a filled rectangle."""
         if not isinstance(rect, RECT_CLASSES):
             raise TypeError("screen.draw.filled_rect() requires a rect to draw")
-        pygame.draw.rect(self._surf, make_color(color), rect, 0)
+        self._mark_dirty(
+            pygame.draw.rect(self._surf, make_color(color), rect, 0)
+        )
 
     def text(self, *args, **kwargs):
         """Draw text to the screen."""
         # FIXME: expose ptext parameters, for autocompletion and autodoc
-        ptext.draw(*args, surf=self._surf, **kwargs)
+        tsurf, pos = ptext.draw(*args, surf=self._surf, **kwargs)
+        self._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
 
     def textbox(self, *args, **kwargs):
         """Draw text to the screen, wrapped to fit a box"""
         # FIXME: expose ptext parameters, for autocompletion and autodoc
-        ptext.drawbox(*args, surf=self._surf, **kwargs)
+        tsurf, pos = ptext.drawbox(*args, surf=self._surf, **kwargs)
+        self._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
 
 
 def blit_gradient(start, stop, dest_surface):
@@ -137,9 +176,67 @@ def blit_gradient(start, stop, dest_surface):
 
 class Screen:
     """Interface to the screen."""
+
+    # Dirty rectangle tracking. When enabled, _dirty is a list of the areas
+    # of the screen changed since the last display update, and _content is a
+    # list of the areas that differ from the solid background colour
+    # _background (or None if the background is not a solid colour).
+    _dirty = None
+    _content = ()
+    _background = None
+    _full_update = True
+
+    # Above these limits (a number of rects, or a fraction of the screen's
+    # area), updating the whole display is cheaper than merging the rects
+    MAX_DIRTY_RECTS = 200
+    MAX_DIRTY_AREA = 0.5
+
     def _set_surface(self, surface):
         self.surface = surface
         self.width, self.height = surface.get_size()
+        self._full_update = True
+
+    def _set_dirty_tracking(self, enabled):
+        """Enable or disable recording of the areas of the screen drawn."""
+        if enabled:
+            self._dirty = []
+            self._content = []
+        else:
+            self._dirty = None
+            self._content = ()
+        self._background = None
+        self._full_update = True
+
+    def _mark_dirty(self, rect):
+        if self._dirty is not None:
+            self._dirty.append(rect)
+            self._content.append(rect)
+
+    def _take_dirty_rects(self):
+        """Get the areas to update on the display, and reset tracking.
+
+        Return None if the whole display needs to be updated.
+
+        """
+        if self._full_update or self._too_dirty(self._dirty):
+            rects = None
+        else:
+            rects = merge_rects(self._dirty)
+        self._dirty = []
+        if len(self._content) > self.MAX_DIRTY_RECTS:
+            # Too many to merge; treat the whole screen as drawn on
+            self._content = [pygame.Rect(0, 0, self.width, self.height)]
+        else:
+            self._content = merge_rects(self._content)
+        self._full_update = False
+        return rects
+
+    def _too_dirty(self, rects):
+        """Return True if the whole display should be updated instead."""
+        if len(rects) > self.MAX_DIRTY_RECTS:
+            return True
+        area = sum(r[2] * r[3] for r in rects)
+        return area > self.MAX_DIRTY_AREA * self.width * self.height
 
     def bounds(self):
         """Return a Rect representing the bounds of the screen."""
@@ -155,8 +252,19 @@ class Screen:
             start = make_color(color)
             stop = make_color(gcolor)
             blit_gradient(start, stop, self.surface)
+            background = None
         else:
             self.surface.fill(make_color(color))
+            background = self.surface.map_rgb(make_color(color))
+
+        if self._dirty is not None:
+            if background is None or background != self._background:
+                self._full_update = True
+            else:
+                # Only the areas drawn over the background have changed
+                self._dirty.extend(self._content)
+            self._content = []
+            self._background = background
 
     def blit(self, image, pos):
         """Draw a sprite onto the screen.
@@ -176,7 +284,36 @@ class Screen:
         """
         if isinstance(image, str):
             image = loaders.images.load(image)
-        self.surface.blit(image, pos, None, pygame.BLEND_ALPHA_SDL2)
+        self._mark_dirty(
+            self.surface.blit(image, pos, None, pygame.BLEND_ALPHA_SDL2)
+        )
+
+    def draw_actors(self, actors):
+        """Draw many Actors onto the screen in a single batch.
+
+        This blits each Actor's image just as ``Actor.draw()`` does, but is
+        much faster for large numbers of Actors. Actors that lie entirely
+        outside the screen are skipped. ``draw()`` methods overridden in
+        subclasses of Actor are not called.
+
+        :param actors: An iterable of Actors, drawn in order.
+
+        """
+        sw = self.width
+        sh = self.height
+        blits = []
+        for actor in actors:
+            r = actor._rect
+            x = r.x
+            y = r.y
+            if x >= sw or y >= sh or x + r.w <= 0 or y + r.h <= 0:
+                continue
+            blits.append((actor._build_transformed_surf(), (x, y)))
+        if self._dirty is None:
+            self.surface.blits(blits, doreturn=False)
+        else:
+            for r in self.surface.blits(blits):
+                self._mark_dirty(r)
 
     @property
     def draw(self):
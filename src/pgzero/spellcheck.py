@@ -95,7 +95,10 @@ CONSTS = [
     'TITLE',
     'WIDTH',
     'HEIGHT',
-    'ICON'
+    'ICON',
+    'DIRTY_RECTS',
+    'UPDATE_RATE',
+    'FPS',
 ]
 
 # Available parameters for each hook
@@ -109,7 +112,7 @@ VALID_PARAMS = {
     'on_mouse_move': ['pos', 'buttons', 'rel'],
     'on_key_up': ['key', 'mod'],
     'on_key_down': ['unicode', 'key', 'mod'],
-    'draw': [],
+    'draw': ['alpha'],
     'on_music_end': [],
 }
 
@@ -34,6 +34,18 @@ def _get_platform_pgzero_path():
     return os.path.expanduser(os.path.join('~', '.config/pgzero/saves'))
 
 
+def _get_platform_cache_path():
+    r"""Get the directory for pgzero's cache of decoded images.
+
+    Under Windows, return %APPDATA%\pgzero\cache. Under Linux/MacOS, return
+    ~/.config/pgzero/cache.
+
+    """
+    if platform.system() == 'Windows':
+        return os.path.join(_get_platform_pgzero_path(), 'cache')
+    return os.path.expanduser(os.path.join('~', '.config/pgzero/cache'))
+
+
 class Storage(dict):
     """Behaves like a dictionary that serialises itself to disk.
 
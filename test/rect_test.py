@@ -1,6 +1,7 @@
 import unittest
 import pygame
-from pgzero.rect import ZRect as Rect
+import numpy as np
+from pgzero.rect import ZRect as Rect, RectArray
 
 
 class RectTypeTest(unittest.TestCase):
@@ -767,6 +768,141 @@ class PGZeroRectText(unittest.TestCase):
         r = Rect(0, 0, 1, 1)
         self.assertTrue(r.collidepoint((0.5, 0.5)))
 
+    def test_slots(self):
+        r = Rect(1, 2, 3, 4)
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertIs(r.rect, r)
+
+    def test_setitem(self):
+        r = Rect(1, 2, 3, 4)
+        r[2] = 5
+        self.assertEqual(r, (1, 2, 5, 4))
+
+    def test_methods_accept_all_forms(self):
+        r = Rect(0, 0, 10, 10)
+        for other in [
+            Rect(5, 5, 10, 10),
+            pygame.Rect(5, 5, 10, 10),
+            ((5, 5), (10, 10)),
+            (5, 5, 10, 10),
+        ]:
+            self.assertTrue(r.colliderect(other))
+            self.assertEqual(r.clip(other), (5, 5, 5, 5))
+            self.assertEqual(r.union(other), (0, 0, 15, 15))
+            self.assertFalse(r.contains(other))
+        self.assertTrue(r.colliderect((5, 5), (10, 10)))
+        self.assertEqual(r.unionall([(5, 5, 10, 10), pygame.Rect(-1, 0, 1, 1)]),
+                         (-1, 0, 16, 15))
+
+
+class RectArrayTest(unittest.TestCase):
+    RECTS = [
+        Rect(0, 0, 10, 10),
+        (20, 0, 10, 10),
+        pygame.Rect(5, 5, 10, 10),
+        ((100, 100), (1, 1)),
+    ]
+
+    def setUp(self):
+        self.rects = [Rect(r) for r in self.RECTS]
+        self.array = RectArray(self.RECTS)
+
+    def assertMatches(self, array, rects):
+        self.assertEqual(list(array), rects)
+
+    def test_construct(self):
+        self.assertEqual(len(self.array), 4)
+        self.assertEqual(self.array[2], (5, 5, 10, 10))
+        self.assertMatches(self.array, self.rects)
+        self.assertEqual(len(RectArray()), 0)
+
+    def test_from_rect_attribute(self):
+        class Thing:
+            rect = Rect(1, 2, 3, 4)
+        self.assertEqual(RectArray([Thing()])[0], (1, 2, 3, 4))
+
+    def test_columns(self):
+        np.testing.assert_array_equal(self.array.x, [0, 20, 5, 100])
+        np.testing.assert_array_equal(self.array.right, [10, 30, 15, 101])
+        a = RectArray.from_columns([1, 2], [3, 4], [5, 6], [7, 8])
+        self.assertMatches(a, [Rect(1, 3, 5, 7), Rect(2, 4, 6, 8)])
+
+    def test_index(self):
+        self.assertMatches(self.array[1:3], self.rects[1:3])
+        self.assertMatches(
+            self.array[np.array([True, False, False, True])],
+            [self.rects[0], self.rects[3]]
+        )
+
+    def test_collidepoint(self):
+        for pos in [(0, 0), (9.5, 9.5), (10, 10), (100, 100)]:
+            np.testing.assert_array_equal(
+                self.array.collidepoint(pos),
+                [r.collidepoint(pos) for r in self.rects]
+            )
+        self.assertTrue(self.array.collidepoint(100, 100)[3])
+
+    def test_colliderect(self):
+        for other in [(8, 8, 4, 4), (10, 0, 10, 10), Rect(-5, -5, 200, 200)]:
+            np.testing.assert_array_equal(
+                self.array.colliderect(other),
+                [r.colliderect(other) for r in self.rects]
+            )
+            self.assertEqual(
+                self.array.collidelistall(other),
+                Rect(other).collidelistall(self.rects)
+            )
+            self.assertEqual(
+                self.array.collidelist(other),
+                Rect(other).collidelist(self.rects)
+            )
+
+    def test_zrect_accepts_rect_array(self):
+        r = Rect(8, 8, 4, 4)
+        self.assertEqual(r.collidelistall(self.array), [0, 2])
+        self.assertEqual(r.collidelist(self.array), 0)
+        self.assertEqual(Rect(50, 50, 1, 1).collidelist(self.array), -1)
+
+    def test_clip_and_union(self):
+        for other in [(8, 8, 4, 4), (10, 0, 10, 10), Rect(-5, -5, 20, 20)]:
+            self.assertMatches(
+                self.array.clip(other), [r.clip(other) for r in self.rects]
+            )
+            self.assertMatches(
+                self.array.union(other), [r.union(other) for r in self.rects]
+            )
+        self.assertEqual(self.array.unionall(), (0, 0, 101, 101))
+
+    def test_move(self):
+        moved = self.array.move(1, 2)
+        self.assertMatches(moved, [r.move(1, 2) for r in self.rects])
+        self.assertMatches(self.array, self.rects)
+        self.array.move_ip(np.arange(4), 0)
+        self.assertEqual(self.array[3], (103, 100, 1, 1))
+
+    def test_collide_pairs(self):
+        rects = [Rect(x * 37 % 200, x * 53 % 150, 20, 20) for x in range(60)]
+        array = RectArray(rects)
+        expected = {
+            (i, j)
+            for i, a in enumerate(rects)
+            for j, b in enumerate(rects)
+            if i < j and a.colliderect(b)
+        }
+        self.assertEqual(set(zip(*array.collide_pairs())), expected)
+
+        others = rects[::3]
+        expected = {
+            (i, j)
+            for i, a in enumerate(rects)
+            for j, b in enumerate(others)
+            if a.colliderect(b)
+        }
+        self.assertEqual(set(zip(*array.collide_pairs(others))), expected)
+        matrix = array.collide_matrix(others)
+        self.assertEqual(matrix.shape, (60, 20))
+        self.assertEqual(set(zip(*matrix.nonzero())), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
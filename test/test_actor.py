@@ -1,9 +1,13 @@
+import copy
+import gc
 import unittest
 
 import pygame
 
-from pgzero.actor import calculate_anchor, Actor
-from pgzero.loaders import set_root
+from pgzero.actor import (
+    calculate_anchor, Actor, SurfaceCache, surface_cache, _rotation_frames
+)
+from pgzero.loaders import images, set_root
 
 
 TEST_MODULE = "pgzero.actor"
@@ -41,6 +45,9 @@ class ActorTest(unittest.TestCase):
     def tearDownClass(self):
         pygame.display.quit()
 
+    def setUp(self):
+        surface_cache.clear()
+
     def test_sensible_init_defaults(self):
         a = Actor("alien")
 
@@ -146,3 +153,244 @@ class ActorTest(unittest.TestCase):
         a = Actor("alien")
         for attribute in dir(a):
             a.__getattr__(attribute)
+
+    def test_rect_attributes_are_properties(self):
+        """Rect attributes don't go through __getattr__/__setattr__."""
+        self.assertIs(Actor.__setattr__, object.__setattr__)
+        for attribute in Actor.DELEGATED_ATTRIBUTES:
+            self.assertIsInstance(getattr(Actor, attribute), property)
+
+    def test_set_rect_attribute(self):
+        """Setting a rect attribute moves the actor."""
+        a = Actor("alien", topleft=(0, 0))
+        a.midright = (100, 100)
+        self.assertEqual(a._rect.midright, (100, 100))
+        self.assertEqual(a.pos, (100 - a.width / 2, 100))
+
+    def test_transformed_surfaces_shared(self):
+        """Actors with the same image, angle and opacity share a surface."""
+        a = Actor('alien')
+        b = Actor('alien')
+        a.angle = b.angle = 45
+        a.opacity = b.opacity = 0.5
+
+        self.assertIs(
+            a._build_transformed_surf(),
+            b._build_transformed_surf()
+        )
+
+    def test_transformed_surfaces_not_shared(self):
+        """Actors with different angles don't share a surface."""
+        a = Actor('alien')
+        b = Actor('alien')
+        a.angle = 45
+        b.angle = 46
+
+        self.assertIsNot(
+            a._build_transformed_surf(),
+            b._build_transformed_surf()
+        )
+
+    def test_rotate_after_shared_surface(self):
+        """An Actor can be rotated again after using a shared surface."""
+        a = Actor('alien')
+        b = Actor('alien')
+        a.opacity = b.opacity = 0.5
+        a.angle = b.angle = 90
+        a._build_transformed_surf()
+        b._build_transformed_surf()
+
+        b.angle = 0
+        self.assertEqual(
+            b._build_transformed_surf().get_size(),
+            (66, 92)
+        )
+
+
+class SurfaceCacheTest(unittest.TestCase):
+    def test_quantise(self):
+        """Angles are rounded to the nearest step."""
+        cache = SurfaceCache(angle_step=5)
+        self.assertEqual(cache.quantise(13), 15)
+        self.assertEqual(cache.quantise(12.4), 10)
+
+    def test_no_quantise(self):
+        """Angles are unchanged by default."""
+        self.assertEqual(SurfaceCache().quantise(12.4), 12.4)
+
+    def test_stale(self):
+        """Surfaces built from a different original are not returned."""
+        cache = SurfaceCache()
+        orig = pygame.Surface((10, 10))
+        surf = pygame.Surface((10, 10))
+        cache.put('key', orig, surf)
+        self.assertIs(cache.get('key', orig), surf)
+        self.assertIsNone(cache.get('key', pygame.Surface((10, 10))))
+        self.assertEqual(cache.bytes, 0)
+
+    def test_evict_lru(self):
+        """The least recently used surface is evicted when over budget."""
+        orig = pygame.Surface((10, 10))
+        surfs = [pygame.Surface((10, 10), depth=32) for _ in range(3)]
+        cache = SurfaceCache(max_bytes=2 * 10 * 10 * 4)
+        cache.put('a', orig, surfs[0])
+        cache.put('b', orig, surfs[1])
+        cache.get('a', orig)
+        cache.put('c', orig, surfs[2])
+        self.assertIs(cache.get('a', orig), surfs[0])
+        self.assertIsNone(cache.get('b', orig))
+        self.assertIs(cache.get('c', orig), surfs[2])
+
+    def test_original_freed(self):
+        """Surfaces are dropped when the original they were built from is."""
+        cache = SurfaceCache()
+        orig = pygame.Surface((10, 10))
+        cache.put('key', orig, pygame.Surface((10, 10)))
+        del orig
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+
+class RotationStepsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((TEST_DISP_W, TEST_DISP_H))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def test_frames_shared(self):
+        """Actors with the same rotation steps share pre-rotated frames."""
+        a = Actor('alien', rotation_steps=8)
+        b = Actor('alien', rotation_steps=8)
+        self.assertEqual(len(a._rotation_frames), 8)
+        for fa, fb in zip(a._rotation_frames, b._rotation_frames):
+            self.assertIs(fa, fb)
+
+    def test_frames_released(self):
+        """Frames are released when their image is no longer used."""
+        images.unload_all()
+        a = Actor('alien', rotation_steps=8)
+        self.assertEqual(len(_rotation_frames), 1)
+        del a
+        images.unload_all()
+        gc.collect()
+        self.assertEqual(len(_rotation_frames), 0)
+
+    def test_unused_evicted(self):
+        """Rotated images can be unloaded once no Actor uses them."""
+        self.addCleanup(setattr, images, 'max_bytes', None)
+        images.unload_all()
+        a = Actor('alien')
+        a.angle = 30
+        a._build_transformed_surf()
+        b = Actor('alien', rotation_steps=8)
+        b.angle = 90
+        b._build_transformed_surf()
+        images.max_bytes = 0
+        self.assertEqual(images.stats()['count'], 1)
+        del a, b
+        gc.collect()
+        images.max_bytes = 0
+        self.assertEqual(images.stats()['count'], 0)
+
+    def test_copy_not_evicted(self):
+        """Deleting a copy of an Actor doesn't let its image be unloaded."""
+        self.addCleanup(setattr, images, 'max_bytes', None)
+        images.unload_all()
+        a = Actor('alien')
+        b = copy.copy(a)
+        del b
+        gc.collect()
+        images.max_bytes = 0
+        self.assertEqual(images.stats()['count'], 1)
+
+    def test_nearest_frame(self):
+        """The angle setter selects the nearest pre-rotated frame."""
+        a = Actor('alien', rotation_steps=8)
+        a.angle = 50
+        self.assertEqual(a.angle, 50)
+        self.assertIs(a._build_transformed_surf(), a._rotation_frames[1])
+
+    def test_rect_matches_frame(self):
+        """The Actor's size is that of the rotation step used."""
+        a = Actor('alien', rotation_steps=4)
+        b = Actor('alien')
+        a.angle = 85
+        b.angle = 90
+        self.assertEqual(a.size, b.size)
+        self.assertEqual(a.pos, b.pos)
+
+    def test_opacity(self):
+        """Pre-rotated frames can be made transparent."""
+        a = Actor('alien', rotation_steps=4)
+        a.angle = 90
+        a.opacity = 0.5
+        surf = a._build_transformed_surf()
+        self.assertEqual(surf.get_size(), (92, 66))
+        self.assertIsNot(surf, a._rotation_frames[1])
+
+    def test_invalid_steps(self):
+        """rotation_steps must be a positive integer."""
+        with self.assertRaises(ValueError):
+            Actor('alien', rotation_steps=0)
+
+
+class MaskTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((TEST_DISP_W, TEST_DISP_H))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        surface_cache.clear()
+
+    def test_collidepoint_pixel(self):
+        """Only points on visible pixels collide."""
+        a = Actor('alien', topleft=(10, 10))
+        self.assertTrue(a.collidepoint((10, 10)))
+        self.assertFalse(a.collidepoint_pixel((10, 10)))
+        self.assertTrue(a.collidepoint_pixel(a.center))
+        self.assertFalse(a.collidepoint_pixel(0, 0))
+
+    def test_collide_mask(self):
+        """Actors collide when their visible pixels overlap."""
+        a = Actor('alien', topleft=(0, 0))
+        b = Actor('alien', topleft=(62, 88))
+        self.assertTrue(a.colliderect(b))
+        self.assertIsNone(a.collide_mask(b))
+        b.center = a.center
+        self.assertIsNotNone(a.collide_mask(b))
+        b.left = a.right
+        self.assertIsNone(a.collide_mask(b))
+
+    def test_mask_shared(self):
+        """Actors drawn with the same surface share a mask."""
+        a = Actor('alien')
+        b = Actor('alien')
+        a.angle = b.angle = 30
+        self.assertIs(a._get_mask(), b._get_mask())
+
+    def test_mask_follows_angle(self):
+        """The mask is rebuilt when the Actor rotates."""
+        a = Actor('alien')
+        self.assertEqual(a._get_mask().get_size(), (66, 92))
+        a.angle = 90
+        self.assertEqual(a._get_mask().get_size(), (92, 66))
+
+    def test_opacity_keeps_shape(self):
+        """Transparent Actors collide with (nearly) the same pixels."""
+        a = Actor('alien')
+        count = a._get_mask().count()
+        a.opacity = 0.5
+        # Antialiased edge pixels may round either way
+        self.assertAlmostEqual(a._get_mask().count(), count, delta=count // 50)
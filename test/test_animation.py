@@ -1,9 +1,17 @@
+import io
 from unittest import TestCase
+from collections import namedtuple
+from contextlib import redirect_stderr
 from types import SimpleNamespace
 import gc
 import weakref
 
-from pgzero.animation import animate
+import numpy as np
+
+from pgzero.animation import (
+    Animation, TWEEN_FUNCTIONS, Timeline, animate, get_tween_table, tweener,
+    vector_tween_function
+)
 from pgzero import clock
 
 
@@ -292,3 +300,311 @@ class AnimationTest(TestCase):
         # Ensure animation stopped and attr as expected.
         self.assertFalse(anim.running)
         self.assertEqual(test_obj.attr, expected_attr_val)
+
+
+class Vector:
+    """A value that supports arithmetic, but isn't a number."""
+
+    def __init__(self, v):
+        self.v = v
+
+    def __add__(self, other):
+        return Vector(self.v + other.v)
+
+    def __sub__(self, other):
+        return Vector(self.v - other.v)
+
+    def __mul__(self, n):
+        return Vector(self.v * n)
+
+
+class BatchTest(TestCase):
+    def setUp(self):
+        for anim in list(Animation.animations):
+            anim.stop()
+
+    tearDown = setUp
+
+    def test_vector_tweens(self):
+        """The vectorised tween functions match the scalar ones."""
+        n = np.linspace(0, 1, 101)
+        for name, function in TWEEN_FUNCTIONS.items():
+            with self.subTest(tween=name):
+                expected = [function(x) for x in n]
+                np.testing.assert_allclose(
+                    vector_tween_function(function)(n), expected, atol=1e-12
+                )
+
+    def test_single_clock_callback(self):
+        """Many animations share a single clock callback."""
+        objs = [SimpleNamespace(x=0, pos=(0, 0)) for _ in range(10)]
+        anims = [animate(objs[0], x=10, pos=(10, 20), duration=2)]
+        before = len(clock.clock._each_tick)
+        anims += [animate(o, x=10, pos=(10, 20), duration=2) for o in objs[1:]]
+        self.assertEqual(len(clock.clock._each_tick), before)
+        clock.tick(1)
+        self.assertEqual([o.x for o in objs], [5] * 10)
+        self.assertEqual(objs[0].pos, (5, 10))
+        self.assertIsNotNone(anims[0]._batch)
+
+    def test_namedtuple(self):
+        """Tuple subclasses are tweened as plain tuples, like tween_attr()."""
+        P = namedtuple('P', 'x y')
+        obj = SimpleNamespace(p=P(0, 0), v=0)
+        animate(obj, p=(10, 10), duration=2)
+        animate(obj, v=10, duration=2)
+        clock.tick(1)
+        self.assertEqual(obj.p, (5, 5))
+        self.assertEqual(obj.v, 5)
+
+    def test_error_stops_one_animation(self):
+        """An error setting one attribute doesn't stop other animations."""
+        class Broken:
+            @property
+            def x(self):
+                return 0
+
+            @x.setter
+            def x(self, value):
+                raise ValueError(value)
+
+        obj = SimpleNamespace(x=0)
+        bad = animate(Broken(), x=10, duration=2)
+        good = animate(obj, x=10, duration=2)
+        with redirect_stderr(io.StringIO()) as stderr:
+            clock.tick(1)
+            clock.tick(0.5)
+        self.assertIn('ValueError', stderr.getvalue())
+        self.assertFalse(bad.running)
+        self.assertTrue(good.running)
+        self.assertEqual(obj.x, 7.5)
+
+    def test_callback_removed(self):
+        """The batch callback is removed once all animations finish."""
+        obj = SimpleNamespace(x=0)
+        animate(obj, x=10, duration=1)
+        clock.tick(1.5)
+        self.assertEqual(obj.x, 10)
+        self.assertIsNone(Animation._batch_tick)
+
+    def test_join_during_update(self):
+        """An animation started by on_finished starts the next tick."""
+        obj = SimpleNamespace(x=0)
+
+        def back():
+            animate(obj, x=0, duration=1)
+
+        animate(obj, x=10, duration=1, on_finished=back)
+        clock.tick(1.5)
+        self.assertEqual(obj.x, 10)
+        clock.tick(0.5)
+        self.assertEqual(obj.x, 5)
+
+    def test_user_tween(self):
+        """Batches can use tween functions without a vectorised version."""
+        @tweener
+        def halfway(n):
+            return 0.5
+
+        try:
+            obj = SimpleNamespace(x=0)
+            animate(obj, x=10, tween='halfway')
+            clock.tick(0.1)
+            self.assertEqual(obj.x, 5)
+        finally:
+            del TWEEN_FUNCTIONS['halfway']
+
+    def test_unbatched_values(self):
+        """Values that aren't numbers are animated separately."""
+        obj = SimpleNamespace(v=Vector(0))
+        anim = animate(obj, v=Vector(10), duration=2)
+        self.assertIsNone(anim._batch)
+        clock.tick(1)
+        self.assertEqual(obj.v.v, 5)
+
+
+class TweenTableTest(TestCase):
+    def tearDown(self):
+        Animation.tween_table = False
+
+    def test_accuracy(self):
+        """Tables approximate the tween functions within 2e-3."""
+        n = np.linspace(0, 1, 10001)
+        for name, function in TWEEN_FUNCTIONS.items():
+            table = get_tween_table(function)
+            with self.subTest(tween=name):
+                expected = [function(x) for x in n]
+                self.assertEqual(table(0), function(0))
+                self.assertEqual(table(1), function(1))
+                np.testing.assert_allclose(
+                    [table(x) for x in n], expected, atol=2e-3
+                )
+                np.testing.assert_allclose(
+                    vector_tween_function(table)(n), expected, atol=2e-3
+                )
+
+    def test_cached(self):
+        """Tables are built once per function."""
+        function = TWEEN_FUNCTIONS['out_elastic']
+        self.assertIs(get_tween_table(function), get_tween_table(function))
+
+    def test_per_animation(self):
+        """An animation can use a table."""
+        obj = SimpleNamespace(x=0)
+        anim = animate(obj, x=1, tween='in_elastic', tween_table=True)
+        self.assertIs(
+            anim.function, get_tween_table(TWEEN_FUNCTIONS['in_elastic'])
+        )
+        anim.stop()
+
+    def test_global(self):
+        """Tables can be used for all animations."""
+        Animation.tween_table = True
+        obj = SimpleNamespace(x=0, y=0)
+        anim = animate(obj, x=1, tween='bounce_end')
+        exact = animate(obj, y=1, tween='bounce_end', tween_table=False)
+        self.assertIs(
+            anim.function, get_tween_table(TWEEN_FUNCTIONS['bounce_end'])
+        )
+        self.assertIs(exact.function, TWEEN_FUNCTIONS['bounce_end'])
+        anim.stop()
+        exact.stop()
+
+    def test_user_tween(self):
+        """Tables work with tween functions registered by users."""
+        @tweener
+        def square_root(n):
+            return n ** 0.5
+
+        try:
+            obj = SimpleNamespace(x=0)
+            animate(obj, x=100, tween='square_root', tween_table=True)
+            clock.tick(0.25)
+            self.assertAlmostEqual(obj.x, 50, places=1)
+        finally:
+            del TWEEN_FUNCTIONS['square_root']
+
+
+class TimelineTest(TestCase):
+    def setUp(self):
+        for timeline in list(Timeline.timelines):
+            timeline.stop()
+
+    tearDown = setUp
+
+    def test_sequence(self):
+        """Steps in a sequence run one after another."""
+        obj = SimpleNamespace(x=0, y=0)
+        animate.sequence(
+            animate.step(obj, x=10, duration=1),
+            animate.wait(1),
+            animate.step(obj, y=10, duration=2),
+        )
+        clock.tick(0.5)
+        self.assertEqual((obj.x, obj.y), (5, 0))
+        clock.tick(1)
+        self.assertEqual((obj.x, obj.y), (10, 0))
+        clock.tick(1.5)
+        self.assertEqual((obj.x, obj.y), (10, 5))
+        clock.tick(1)
+        self.assertEqual((obj.x, obj.y), (10, 10))
+        self.assertEqual(Timeline.timelines, [])
+
+    def test_skip_steps(self):
+        """A long tick completes steps in order."""
+        obj = SimpleNamespace(x=0)
+        animate.sequence(
+            animate.step(obj, x=10, duration=1),
+            animate.step(obj, x=20, duration=1),
+            animate.step(obj, x=0, duration=2),
+        )
+        clock.tick(3)
+        self.assertEqual(obj.x, 10)
+
+    def test_parallel(self):
+        """Parallel steps, including nested sequences, run together."""
+        a = SimpleNamespace(x=0)
+        b = SimpleNamespace(x=0)
+
+        def callbacks():
+            return sum(ev.active for ev in clock.clock._each_tick)
+
+        before = callbacks()
+        timeline = animate.parallel(
+            animate.step(a, x=10, duration=2),
+            animate.sequence(
+                animate.step(b, x=10, duration=1),
+                animate.step(b, x=0, duration=1),
+            ),
+        )
+        self.assertEqual(callbacks(), before + 1)
+        self.assertEqual(timeline.duration, 2)
+        clock.tick(1.5)
+        self.assertEqual((a.x, b.x), (7.5, 5))
+
+    def test_functions(self):
+        """Functions in a timeline are called in order."""
+        calls = []
+        finished = []
+        animate.sequence(
+            lambda: calls.append(1),
+            animate.wait(1),
+            animate.sequence(
+                lambda: calls.append(2),
+                on_finished=lambda: calls.append(3),
+            ),
+            lambda: calls.append(4),
+            on_finished=lambda: finished.append(True),
+        )
+        clock.tick(0.5)
+        self.assertEqual(calls, [1])
+        clock.tick(0.5)
+        self.assertEqual(calls, [1, 2, 3, 4])
+        self.assertEqual(finished, [True])
+
+    def test_keyframes(self):
+        """Keyframes tween between values."""
+        obj = SimpleNamespace(x=0, pos=(0, 0))
+        timeline = animate.keyframes(
+            obj,
+            x=[(0, 10), (1, 20), (3, 0)],
+            pos=[(1, (0, 0)), (2, (10, 10))],
+        )
+        self.assertEqual(timeline.duration, 3)
+        clock.tick(0.5)
+        self.assertEqual(obj.x, 15)
+        self.assertEqual(obj.pos, (0, 0))
+        clock.tick(1)
+        self.assertEqual(obj.x, 15)
+        self.assertEqual(obj.pos, (5, 5))
+        clock.tick(2)
+        self.assertEqual(obj.x, 0)
+        self.assertEqual(obj.pos, (10, 10))
+        self.assertFalse(timeline.running)
+
+    def test_stop_complete(self):
+        """Stopping with complete sets the final values."""
+        obj = SimpleNamespace(x=0, y=0)
+        calls = []
+        timeline = animate.sequence(
+            animate.step(obj, x=10),
+            calls.clear,
+            animate.step(obj, y=10),
+        )
+        clock.tick(0.5)
+        timeline.stop(complete=True)
+        self.assertEqual((obj.x, obj.y), (10, 10))
+        self.assertFalse(timeline.running)
+
+    def test_nest_started(self):
+        """Timelines that have already started can't be nested."""
+        obj = SimpleNamespace(x=0)
+        timeline = animate.sequence(animate.step(obj, x=10))
+        clock.tick(0.1)
+        with self.assertRaises(ValueError):
+            animate.sequence(timeline)
+
+    def test_bad_step(self):
+        """Giving something that isn't a step raises TypeError."""
+        with self.assertRaises(TypeError):
+            animate.sequence(1)
@@ -0,0 +1,193 @@
+import random
+import unittest
+
+from pgzero.clock import Clock, TimingWheelClock
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+
+
+class ClockTest(unittest.TestCase):
+    clock_class = Clock
+
+    def setUp(self):
+        self.clock = self.clock_class()
+        self.cb = Recorder()
+
+    def test_schedule(self):
+        """A scheduled callback fires once, after the delay."""
+        self.clock.schedule(self.cb, 1)
+        self.clock.tick(0.5)
+        self.assertEqual(self.cb.calls, [])
+        self.clock.tick(0.5)
+        self.clock.tick(1)
+        self.assertEqual(self.cb.calls, [()])
+
+    def test_schedule_interval(self):
+        """An interval callback fires repeatedly."""
+        self.clock.schedule_interval(self.cb, 1)
+        for _ in range(3):
+            self.clock.tick(1)
+        self.assertEqual(len(self.cb.calls), 3)
+
+    def test_unschedule(self):
+        """Unscheduling removes all scheduled calls of a callback."""
+        self.clock.schedule(self.cb, 1)
+        self.clock.schedule_interval(self.cb, 1)
+        self.clock.each_tick(self.cb)
+        self.clock.unschedule(self.cb)
+        self.clock.tick(2)
+        self.assertEqual(self.cb.calls, [])
+        self.assertEqual(self.clock._by_callback, {})
+
+    def test_unschedule_method(self):
+        """We can unschedule a bound method with a new bound method object."""
+        self.clock.schedule(self.cb.__call__, 1)
+        self.clock.unschedule(self.cb.__call__)
+        self.clock.tick(2)
+        self.assertEqual(self.cb.calls, [])
+
+    def test_cancel_handle(self):
+        """Cancelling a handle cancels only that call."""
+        handle = self.clock.schedule(self.cb, 1)
+        self.clock.schedule(self.cb, 2)
+        handle.cancel()
+        self.clock.tick(3)
+        self.assertEqual(self.cb.calls, [()])
+
+    def test_cancel_interval(self):
+        """An interval handle remains valid after the callback has fired."""
+        handle = self.clock.schedule_interval(self.cb, 1)
+        self.clock.tick(1)
+        handle.cancel()
+        self.clock.tick(1)
+        self.assertEqual(len(self.cb.calls), 1)
+
+    def test_interval_reuses_event(self):
+        """Re-arming an interval event doesn't create a new Event."""
+        handle = self.clock.schedule_interval(self.cb, 1)
+        self.clock.tick(1)
+        self.assertEqual(list(self.clock._by_callback[handle.key]), [handle])
+        self.assertEqual(handle.time, 2)
+
+    def test_same_time_in_scheduled_order(self):
+        """Events due at the same time fire in the order they were scheduled."""
+        order = []
+        callbacks = [lambda i=i: order.append(i) for i in range(10)]
+        for cb in callbacks:
+            self.clock.schedule(cb, 1)
+        self.clock.tick(1)
+        self.assertEqual(order, list(range(10)))
+
+    def test_cancel_fired(self):
+        """Cancelling an event that has fired does nothing."""
+        handle = self.clock.schedule(self.cb, 1)
+        self.clock.tick(1)
+        handle.cancel()
+        self.assertEqual(self.clock._cancelled, 0)
+
+    def test_cancel_each_tick(self):
+        """We can cancel an each_tick callback."""
+        handle = self.clock.each_tick(self.cb)
+        self.clock.tick(1)
+        handle.cancel()
+        self.clock.tick(1)
+        self.assertEqual(self.cb.calls, [(1,)])
+        self.assertEqual(self.clock._each_tick, [])
+
+    def test_cancel_during_tick(self):
+        """A callback cancelled by another callback doesn't fire."""
+        def cancel(dt):
+            handle.cancel()
+
+        self.clock.each_tick(cancel)
+        handle = self.clock.each_tick(self.cb)
+        self.clock.tick(1)
+        self.assertEqual(self.cb.calls, [])
+
+    def test_cancel_many(self):
+        """Cancelled events are eventually dropped."""
+        callbacks = [Recorder() for _ in range(100)]
+        handles = [self.clock.schedule(cb, 1) for cb in callbacks]
+        for h in handles[:90]:
+            h.cancel()
+        self.clock.tick(1)
+        self.assertEqual(sum(len(cb.calls) for cb in callbacks), 10)
+        self.assertEqual(self.clock._cancelled, 0)
+
+    def test_weak_reference(self):
+        """Callbacks that have been garbage collected are dropped."""
+        self.clock.schedule(Recorder(), 1)
+        self.clock.each_tick(Recorder())
+        self.clock.tick(1)
+        self.assertEqual(self.clock._each_tick, [])
+        self.assertEqual(self.clock._by_callback, {})
+
+    def test_clear(self):
+        """Clearing the clock cancels everything."""
+        handle = self.clock.schedule(self.cb, 1)
+        self.clock.each_tick(self.cb)
+        self.clock.clear()
+        self.clock.tick(2)
+        self.assertEqual(self.cb.calls, [])
+        self.assertFalse(handle.active)
+
+    def test_compaction(self):
+        """Cancelled events are removed from the heap before they are due."""
+        callbacks = [Recorder() for _ in range(100)]
+        handles = [self.clock.schedule(cb, 1) for cb in callbacks]
+        for h in handles[:90]:
+            h.cancel()
+        self.assertLess(len(self.clock.events), 100)
+
+
+class TimingWheelClockTest(ClockTest):
+    clock_class = TimingWheelClock
+
+    def test_compaction(self):
+        """The wheel drops cancelled events when their slot comes round."""
+        handles = [self.clock.schedule(Recorder(), 1) for _ in range(100)]
+        for h in handles:
+            h.cancel()
+        self.clock.tick(1)
+        self.assertEqual(self.clock._counts, [0] * self.clock.levels)
+        self.assertFalse(any(any(wheel) for wheel in self.clock._wheels))
+
+    def test_far_future(self):
+        """Events beyond the range of the wheels are scheduled."""
+        clock = TimingWheelClock(resolution=0.01, levels=2)
+        clock.schedule(self.cb, 100)
+        clock.tick(99.995)
+        self.assertEqual(self.cb.calls, [])
+        self.assertEqual(clock._overflow, [])
+        clock.tick(0.005)
+        self.assertEqual(self.cb.calls, [()])
+
+    def test_same_order_as_heap(self):
+        """Events fire in the same order as with the heap clock."""
+        rng = random.Random(0)
+        fired = {Clock: [], TimingWheelClock: []}
+        clocks = [Clock(), TimingWheelClock(resolution=0.01, levels=2)]
+        callbacks = []
+        for i in range(300):
+            delay = rng.choice([0.001, 0.1, 1, 30, 200]) * rng.random()
+            interval = rng.random() < 0.2
+            for clock in clocks:
+                def cb(i=i, clock=clock):
+                    fired[type(clock)].append((i, clock.t))
+                callbacks.append(cb)
+                if interval:
+                    clock.schedule_interval(cb, delay + 0.5)
+                else:
+                    clock.schedule(cb, delay)
+        for _ in range(2000):
+            dt = rng.choice([0.001, 1 / 60, 0.5])
+            for clock in clocks:
+                clock.tick(dt)
+        self.assertEqual(fired[TimingWheelClock], fired[Clock])
+        self.assertGreater(len(fired[Clock]), 300)
@@ -0,0 +1,105 @@
+import unittest
+
+import pygame
+
+from pgzero.actor import Actor
+from pgzero.collision import SpatialHash
+from pgzero.loaders import set_root
+from pgzero.rect import RectArray
+
+
+class SpatialHashTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.index = SpatialHash(cell_size=32)
+
+    def actor(self, topleft):
+        a = Actor('alien', topleft=topleft)
+        self.index.add(a)
+        return a
+
+    def test_len_and_contains(self):
+        """We can add and remove actors."""
+        a = self.actor((0, 0))
+        self.assertEqual(len(self.index), 1)
+        self.assertIn(a, self.index)
+        self.index.remove(a)
+        self.assertEqual(len(self.index), 0)
+        self.assertNotIn(a, self.index)
+        self.assertEqual(self.index._cells, {})
+
+    def test_query_rect(self):
+        """We can find actors colliding with a rect."""
+        a = self.actor((0, 0))
+        b = self.actor((500, 500))
+        self.assertEqual(self.index.query_rect((10, 10, 5, 5)), [a])
+        self.assertEqual(self.index.query_rect(b), [])
+
+    def test_query_point(self):
+        """We can find actors containing a point."""
+        a = self.actor((0, 0))
+        self.assertEqual(self.index.query_point(10, 10), [a])
+        self.assertEqual(self.index.query_point((a.right, 10)), [])
+
+    def test_moving_actor_updates_index(self):
+        """Moving an actor updates the cells it occupies."""
+        a = self.actor((0, 0))
+        a.pos = (1000, 1000)
+        self.assertEqual(self.index.query_point(10, 10), [])
+        self.assertEqual(self.index.query_point(1000, 1000), [a])
+
+    def test_removed_actor_not_updated(self):
+        """Once removed, moving an actor doesn't touch the index."""
+        a = self.actor((0, 0))
+        self.index.remove(a)
+        a.x += 100
+        self.assertEqual(a._spatial_indexes, ())
+
+    def test_all_pairs(self):
+        """all_pairs() yields each colliding pair once."""
+        a = self.actor((0, 0))
+        b = self.actor((10, 10))
+        self.actor((300, 300))
+        pairs = list(self.index.all_pairs())
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual({id(x) for x in pairs[0]}, {id(a), id(b)})
+
+    def test_all_pairs_matches_colliderect(self):
+        """all_pairs() agrees with pairwise colliderect()."""
+        actors = [self.actor((x * 37 % 400, x * 53 % 300)) for x in range(40)]
+        expected = {
+            frozenset((id(a), id(b)))
+            for i, a in enumerate(actors)
+            for b in actors[i + 1:]
+            if a.colliderect(b)
+        }
+        found = {frozenset((id(a), id(b))) for a, b in self.index.all_pairs()}
+        self.assertEqual(found, expected)
+
+
+class RectArrayActorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def test_from_actors(self):
+        """A RectArray can be built from a list of Actors."""
+        actors = [Actor('alien', topleft=(x * 100, 0)) for x in range(5)]
+        array = RectArray(actors)
+        self.assertEqual(list(array), [a._rect for a in actors])
+        self.assertEqual(array.collidelistall(actors[2]), [2])
@@ -0,0 +1,453 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pygame
+
+from pgzero import loaders
+from pgzero.atlas import pack
+from pgzero.clock import clock
+from pgzero.loaders import (
+    images, sounds, set_root, ImageLoader, InvalidCase, Preload
+)
+
+IMAGES = Path(__file__).parent / 'images'
+
+
+class PreloadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        images.unload_all()
+        sounds.unload_all()
+
+    def test_preload(self):
+        """Preloaded images are cached, converted for drawing."""
+        p = images.preload(['alien'])
+        self.assertEqual(p.total, 1)
+        p.wait()
+        self.assertTrue(p.finished)
+        self.assertEqual(p.progress, 1.0)
+        surf = images._cache[images.cache_key('alien', (), {})]
+        self.assertIs(images.load('alien'), surf)
+        self.assertTrue(surf.get_flags() & pygame.SRCALPHA)
+
+    def test_finished_on_tick(self):
+        """Preloads are finished as the clock ticks."""
+        p = images.preload(['alien'])
+        p._items[0][2].result()
+        clock.tick(0.01)
+        self.assertTrue(p.finished)
+        self.assertEqual(p.done, 1)
+        self.assertNotIn(p, loaders._active_preloads)
+
+    def test_load_while_pending(self):
+        """Loading a resource that is being preloaded waits for it."""
+        p = images.preload(['alien'])
+        surf = images.load('alien')
+        p.wait()
+        self.assertIs(images.load('alien'), surf)
+
+    def test_already_loaded(self):
+        """Resources that are already loaded count as done."""
+        images.load('alien')
+        p = images.preload(['alien'])
+        self.assertTrue(p.finished)
+        self.assertEqual((p.done, p.total), (1, 1))
+
+    def test_preload_directory(self):
+        """With no names, everything in the directory is preloaded."""
+        p = images.preload()
+        p.wait()
+        self.assertEqual(p.total, 2)
+        self.assertIn(images.cache_key('alien_as_webp', (), {}), images._cache)
+
+    def test_missing(self):
+        """Preloading a missing resource fails immediately."""
+        with self.assertRaises(KeyError):
+            images.preload(['nonexistent'])
+
+    def test_sounds(self):
+        """Sounds can be preloaded."""
+        p = sounds.preload(['powerup'])
+        p.wait()
+        self.assertIsInstance(sounds.load('powerup'), pygame.mixer.Sound)
+
+    def test_bad_file(self):
+        """A file that can't be loaded doesn't stop the others."""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        self.addCleanup(set_root, __file__)
+        set_root(str(tmp))
+        (tmp / 'images').mkdir()
+        (tmp / 'images' / 'a.png').write_bytes(b'not a png')
+        for name in 'bcd':
+            shutil.copy(IMAGES / 'alien.png', tmp / 'images' / f'{name}.png')
+        loader = ImageLoader('images')
+        p = loader.preload(['a', 'b', 'c', 'd'])
+        for future in [item[2] for item in p._items]:
+            future.exception()
+        with mock.patch.object(loaders, 'PRELOAD_FINISH_TIME', 1):
+            clock.tick(0.01)
+        self.assertTrue(p.finished)
+        self.assertEqual(p.done, 4)
+        self.assertEqual([name for name, e in p.failed], ['a'])
+        self.assertEqual(loader.stats()['count'], 3)
+        with self.assertRaises(pygame.error):
+            loader.load('a')
+
+    def test_bad_file_wait(self):
+        """wait() also carries on past files that can't be loaded."""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        self.addCleanup(set_root, __file__)
+        set_root(str(tmp))
+        (tmp / 'images').mkdir()
+        (tmp / 'images' / 'a.png').write_bytes(b'not a png')
+        shutil.copy(IMAGES / 'alien.png', tmp / 'images' / 'b.png')
+        loader = ImageLoader('images')
+        p = loader.preload(['a', 'b'])
+        p.wait()
+        self.assertEqual(len(p.failed), 1)
+        self.assertEqual(loader.load('b').get_size(), (66, 92))
+
+    def test_empty(self):
+        """An empty preload is finished."""
+        p = Preload([])
+        self.assertTrue(p.finished)
+        self.assertEqual(p.progress, 1.0)
+
+
+class IndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(set_root, __file__)
+        set_root(str(self.tmp))
+        (self.tmp / 'images' / 'sub').mkdir(parents=True)
+        self.add('alien.png')
+        self.add('sub/alien.png')
+        self.loader = ImageLoader('images')
+
+    def add(self, name):
+        shutil.copy(IMAGES / 'alien.png', self.tmp / 'images' / name)
+
+    def test_index(self):
+        """Files are indexed with and without their extensions."""
+        index = self.loader._get_index()
+        self.assertEqual(index['alien'], index['alien.png'])
+        self.assertEqual(
+            index['sub/alien'],
+            os.path.join(str(self.tmp), 'images', 'sub', 'alien.png')
+        )
+        self.assertEqual(self.loader._index_dirs, {'sub'})
+
+    def test_extension_precedence(self):
+        """Extensions are tried in the order of EXTNS."""
+        self.add('alien.gif')
+        self.loader.refresh()
+        self.assertEqual(self.loader._find('alien'), self.loader._find('alien.png'))
+
+    def test_load(self):
+        """Images are loaded through the index, including subdirectories."""
+        self.assertEqual(dir(self.loader), ['alien'])
+        self.assertEqual(self.loader.load('alien').get_size(), (66, 92))
+        self.assertEqual(self.loader.sub.alien.get_size(), (66, 92))
+
+    def test_new_file(self):
+        """Files created after the index was built can be loaded."""
+        self.loader._get_index()
+        self.add('new.png')
+        self.assertEqual(self.loader.load('new').get_size(), (66, 92))
+        self.assertNotIn('new', dir(self.loader))
+        self.loader.refresh()
+        self.assertIn('new', dir(self.loader))
+
+    def test_upper_case(self):
+        """Files that are not lower case can't be loaded."""
+        self.add('Upper.png')
+        self.assertNotIn('Upper', self.loader._get_index())
+        with self.assertRaises(InvalidCase):
+            self.loader.load('Upper')
+
+    def test_missing(self):
+        """Missing files are reported."""
+        with self.assertRaisesRegex(KeyError, 'No image found like'):
+            self.loader.load('missing')
+
+    def test_root_changed(self):
+        """The index is rebuilt if the root changes."""
+        self.loader._get_index()
+        set_root(__file__)
+        self.assertIn('alien_as_webp', self.loader._get_index())
+
+
+class BudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.loader = ImageLoader('images')
+        self.size = 66 * 92 * 4
+
+    def test_sizes(self):
+        """The cache knows the size of the resources it holds."""
+        self.loader.load('alien')
+        self.assertEqual(self.loader.stats()['bytes'], self.size)
+        sounds.unload_all()
+        sound = sounds.load('powerup')
+        self.assertEqual(sounds.stats()['bytes'], len(sound.get_raw()))
+
+    def test_stats(self):
+        """Hits and misses are counted."""
+        self.loader.load('alien')
+        self.loader.load('alien')
+        self.loader.unload('alien')
+        self.assertEqual(self.loader.stats(), {
+            'count': 0, 'bytes': 0, 'hits': 1, 'misses': 1, 'evictions': 0,
+        })
+
+    def test_evict_lru(self):
+        """The least recently used resources are unloaded over budget."""
+        self.loader.max_bytes = self.size + self.size // 2
+        self.loader.load('alien')
+        self.loader.load('alien_as_webp')
+        self.assertEqual(
+            list(self.loader._cache), [self.loader.cache_key('alien_as_webp', (), {})]
+        )
+        self.assertEqual(self.loader.stats()['evictions'], 1)
+
+    def test_used_not_evicted(self):
+        """Resources used by Actors are not unloaded."""
+        actor = mock.Mock()
+        self.loader.max_bytes = self.size
+        self.loader._use('alien', actor)
+        self.loader.load('alien_as_webp')
+        self.assertEqual(self.loader.stats()['bytes'], self.size * 2)
+        self.loader._release('alien', actor)
+        self.loader.max_bytes = 0
+        self.assertEqual(self.loader.stats()['count'], 0)
+
+    def test_referenced_reused(self):
+        """Unloaded resources still referenced are reused by load()."""
+        self.loader.max_bytes = self.size
+        alien = self.loader.load('alien')
+        self.loader.load('alien_as_webp')
+        self.assertEqual(self.loader.stats()['evictions'], 1)
+        self.assertIs(self.loader.load('alien'), alien)
+
+    def test_attribute_evicted(self):
+        """Resources loaded as attributes can be unloaded."""
+        self.loader.max_bytes = self.size
+        self.assertIsNotNone(self.loader.alien)
+        self.loader.load('alien_as_webp')
+        self.assertNotIn('alien', self.loader.__dict__)
+        self.assertEqual(self.loader.stats()['evictions'], 1)
+
+    def test_pinned_not_evicted(self):
+        """Pinned resources are not unloaded."""
+        self.loader.pin('alien')
+        self.loader.max_bytes = 0
+        self.assertEqual(self.loader.stats()['count'], 1)
+        self.loader.unpin('alien')
+        self.loader.max_bytes = 0
+        self.assertEqual(self.loader.stats()['count'], 0)
+
+
+class AtlasTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(set_root, __file__)
+        set_root(str(self.tmp))
+        (self.tmp / 'images' / 'tiles').mkdir(parents=True)
+        for i in range(10):
+            surf = pygame.Surface((10 + i, 20 - i), pygame.SRCALPHA)
+            surf.fill((i * 20, 100, 0, 128 + i))
+            pygame.image.save(surf, str(self.tmp / 'images' / f'sprite{i}.png'))
+        pygame.image.save(
+            pygame.Surface((300, 10)), str(self.tmp / 'images' / 'wide.png')
+        )
+        pygame.image.save(
+            pygame.Surface((8, 8)), str(self.tmp / 'images' / 'tiles' / 'grass.png')
+        )
+        self.loader = ImageLoader('images')
+
+    def test_pack(self):
+        """Packed rects don't overlap and lie within their pages."""
+        sizes = [(10 + i * 7 % 40, 5 + i * 13 % 30) for i in range(100)]
+        positions = pack(sizes, 64)
+        rects = [
+            (page, pygame.Rect(x, y, w, h))
+            for (page, x, y), (w, h) in zip(positions, sizes)
+        ]
+        for i, (page, r) in enumerate(rects):
+            self.assertTrue(pygame.Rect(0, 0, 64, 64).contains(r))
+            for other_page, other in rects[i + 1:]:
+                self.assertFalse(page == other_page and r.colliderect(other))
+        self.assertEqual(pack([(65, 1)], 64), [None])
+
+    def test_build_atlas(self):
+        """Packed images are subsurfaces, with the same pixels."""
+        atlas = self.loader.build_atlas(page_size=64)
+        self.assertEqual(len(atlas.regions), 10)
+        self.assertNotIn('tiles/grass', atlas.regions)
+        for i in range(10):
+            surf = self.loader.load(f'sprite{i}')
+            self.assertIn(surf.get_parent(), atlas.pages)
+            self.assertEqual(surf.get_size(), (10 + i, 20 - i))
+            self.assertEqual(surf.get_at((3, 3)), (i * 20, 100, 0, 128 + i))
+        # Too big for a page, so loaded as usual
+        self.assertIsNone(self.loader.load('wide').get_parent())
+
+    def test_subdir(self):
+        """The images in a subdirectory can be packed."""
+        atlas = self.loader.build_atlas('tiles')
+        self.assertEqual(list(atlas.regions), ['tiles/grass'])
+        self.assertIsNotNone(self.loader.load('tiles/grass').get_parent())
+
+    def test_layout(self):
+        """The layout is saved, and used if the images haven't changed."""
+        atlas = self.loader.build_atlas(page_size=64, layout='atlas.json')
+        self.assertTrue((self.tmp / 'images' / 'atlas.json').exists())
+        with mock.patch('pgzero.atlas.pack') as pack_mock:
+            again = ImageLoader('images').build_atlas(
+                page_size=64, layout='atlas.json'
+            )
+        pack_mock.assert_not_called()
+        self.assertEqual(again.regions, atlas.regions)
+
+        pygame.image.save(
+            pygame.Surface((5, 5)), str(self.tmp / 'images' / 'sprite0.png')
+        )
+        with mock.patch('pgzero.atlas.pack', wraps=pack) as pack_mock:
+            ImageLoader('images').build_atlas(page_size=64, layout='atlas.json')
+        pack_mock.assert_called_once()
+
+
+class DiskCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        pygame.display.set_mode((200, 100))
+
+    @classmethod
+    def tearDownClass(self):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(set_root, __file__)
+        set_root(str(self.tmp))
+        (self.tmp / 'images').mkdir()
+        self.image = self.tmp / 'images' / 'alien.png'
+        shutil.copy(IMAGES / 'alien.png', self.image)
+        self.cache_dir = str(self.tmp / 'cache')
+
+    def loader(self):
+        loader = ImageLoader('images')
+        self.cache = loader.enable_disk_cache(self.cache_dir)
+        return loader
+
+    def test_cached(self):
+        """Images are loaded from the cache without decoding them."""
+        orig = self.loader().load('alien')
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        with mock.patch('pygame.image.load') as load:
+            cached = self.loader().load('alien')
+        load.assert_not_called()
+        self.assertEqual(cached.get_size(), orig.get_size())
+        self.assertEqual(
+            pygame.image.tobytes(cached, 'RGBA'),
+            pygame.image.tobytes(orig, 'RGBA'),
+        )
+
+    def test_changed_file(self):
+        """Images are decoded again if the file changes."""
+        self.loader().load('alien')
+        st = self.image.stat()
+        os.utime(self.image, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.load(str(self.image)))
+        self.loader().load('alien')
+        # The file for the old version of the image was deleted
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertIsNotNone(self.cache.load(str(self.image)))
+
+    def test_write_error(self):
+        """Temporary files are deleted if the cache can't be written."""
+        with mock.patch('os.replace', side_effect=OSError):
+            self.assertEqual(self.loader().load('alien').get_size(), (66, 92))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_old_pygame(self):
+        """Pygame versions without the BGRA pixel format cache nothing."""
+        with mock.patch('pgzero.imagecache._tobytes', None):
+            self.assertEqual(self.loader().load('alien').get_size(), (66, 92))
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.loader().load('alien')
+        with mock.patch('pygame.image.frombuffer', side_effect=ValueError):
+            self.assertIsNone(self.cache.load(str(self.image)))
+
+    def test_list_once(self):
+        """The cache directory is listed once, not for every save."""
+        self.loader()
+        surf = pygame.Surface((2, 2))
+        with mock.patch('os.listdir', wraps=os.listdir) as listdir:
+            for name in ('a', 'b', 'c'):
+                path = self.tmp / f'{name}.png'
+                pygame.image.save(surf, str(path))
+                self.cache.save(str(path), surf)
+        self.assertEqual(listdir.call_count, 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_corrupt(self):
+        """Damaged cache files are ignored."""
+        self.loader().load('alien')
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'r+b') as f:
+                f.truncate(20)
+        self.assertIsNone(self.cache.load(str(self.image)))
+        self.assertEqual(self.loader().load('alien').get_size(), (66, 92))
+
+    def test_clear(self):
+        """The cache can be cleared."""
+        self.loader().load('alien')
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
@@ -0,0 +1,74 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from pgzero import clock
+from pgzero.profiler import FrameProfiler, PHASES, percentile
+from pgzero.runner import load_and_run
+
+game_tests = Path(__file__).parent / 'game_tests'
+
+
+class PercentileTest(unittest.TestCase):
+    def test_percentile(self):
+        """Percentiles are calculated by nearest rank."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile(values, 0), 1)
+
+    def test_empty(self):
+        """The percentile of no values is 0."""
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class FrameProfilerTest(unittest.TestCase):
+    def test_phases(self):
+        """Time between marks is attributed to each phase."""
+        profiler = FrameProfiler()
+        profiler.start_frame()
+        for phase in PHASES:
+            profiler.mark(phase)
+        profiler.mark('update')
+        profiler.end_frame(1 / 60)
+
+        self.assertEqual(profiler.count, 1)
+        for phase in PHASES:
+            self.assertEqual(len(profiler.times[phase]), 1)
+        self.assertAlmostEqual(profiler.fps(), 60)
+
+    def test_stats_empty(self):
+        """We can get stats before any frames have run."""
+        self.assertEqual(FrameProfiler().stats()['p99'], 0.0)
+
+    def test_history(self):
+        """Only the given number of frames are kept for statistics."""
+        profiler = FrameProfiler(history=10)
+        for _ in range(20):
+            profiler.start_frame()
+            profiler.end_frame(0.01)
+        self.assertEqual(len(profiler.times['total']), 10)
+        self.assertEqual(profiler.count, 20)
+
+
+class ProfileOutTest(unittest.TestCase):
+    def test_profile_out(self):
+        """We can write per-frame timings while running a game."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / 'profile.jsonl'
+            clock.schedule_unique(sys.exit, 0.05)
+            with self.assertRaises(SystemExit):
+                load_and_run(
+                    str(game_tests / 'utf8.py'),
+                    overlay=True,
+                    profile_out=str(out),
+                )
+            records = [json.loads(line) for line in out.open()]
+
+        self.assertGreater(len(records), 0)
+        self.assertEqual(records[0]['frame'], 1)
+        for phase in PHASES + ('dt', 'total'):
+            self.assertIn(phase, records[0])
@@ -4,10 +4,18 @@ This module is also a Pygame Zero game so that we can run it with pgzero.
 
 """
 import sys
+import tempfile
 import unittest
+from contextlib import redirect_stderr
+from io import StringIO
 from pathlib import Path
+from unittest import mock
 
-from pgzero.runner import load_and_run
+import pygame
+
+from pgzero.runner import (
+    load_and_run, load_input_script, main, InvalidInputScript
+)
 from pgzero import clock
 
 game_tests = Path(__file__).parent / 'game_tests'
@@ -45,3 +53,59 @@ class RunnerTest(unittest.TestCase):
     def test_run_directory_run_game(self):
         """We can run a directory containing run_game.py"""
         self.assert_runnable(game_tests / 'blue')
+
+
+class HeadlessTest(unittest.TestCase):
+    """Test running games for benchmarking."""
+
+    def test_max_frames(self):
+        """We can run a game for a fixed number of frames."""
+        frames = []
+
+        def on_tick(dt):
+            frames.append(dt)
+
+        clock.each_tick(on_tick)
+        load_and_run(
+            str(game_tests / 'utf8.py'),
+            headless=True,
+            max_frames=10,
+            seed=0,
+        )
+        self.assertEqual(frames, [1 / 60] * 10)
+
+    def test_headless_requires_frames(self):
+        """--headless without --frames is an error, not an endless run."""
+        argv = ['pgzrun', '--headless', str(game_tests / 'utf8.py')]
+        stderr = StringIO()
+        with mock.patch('sys.argv', argv), redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as cm:
+                main()
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn('--headless requires --frames', stderr.getvalue())
+
+    def test_input_script(self):
+        """We can load a script of input events."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'input.jsonl'
+            path.write_text(
+                '{"frame": 3, "type": "MOUSEBUTTONDOWN", '
+                '"pos": [10, 20], "button": 1}\n'
+                '\n'
+                '{"frame": 3, "type": "KEYDOWN", "key": 32, "mod": 0}\n'
+            )
+            events = load_input_script(str(path))
+
+        self.assertEqual(list(events), [3])
+        click, key = events[3]
+        self.assertEqual(click.type, pygame.MOUSEBUTTONDOWN)
+        self.assertEqual(click.pos, (10, 20))
+        self.assertEqual(key.key, 32)
+
+    def test_invalid_input_script(self):
+        """Errors in input scripts are reported with the line number."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'input.jsonl'
+            path.write_text('{"frame": 3, "type": "NOT_AN_EVENT"}\n')
+            with self.assertRaisesRegex(InvalidInputScript, ':1:'):
+                load_input_script(str(path))
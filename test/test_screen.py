@@ -3,12 +3,15 @@ import unittest
 from pathlib import Path
 import os
 import warnings
+from unittest import mock
 
 import numpy as np
 import pygame
 import pygame.image
 import pygame.surfarray
 
+from pgzero import game
+from pgzero.actor import Actor
 from pgzero.screen import Screen
 from pgzero.loaders import set_root, images
 from pgzero.rect import Rect, ZRect
@@ -134,6 +137,24 @@ class ScreenTest(unittest.TestCase):
         self.screen.blit('alien', (0, 0))
         assert_screen_match(self.surf, 'alien_blit')
 
+    def test_draw_actors(self):
+        """draw_actors() matches drawing each actor individually."""
+        actors = [
+            Actor('alien', pos=(50, 50)),
+            Actor('alien', pos=(90, 70)),
+            Actor('alien', pos=(-500, 70)),
+        ]
+        actors[1].angle = 30
+        actors[1].opacity = 0.5
+        self.screen.draw_actors(actors)
+        batched = self.surf.copy()
+
+        self.screen.clear()
+        with mock.patch.object(game, 'screen', self.surf):
+            for a in actors:
+                a.draw()
+        self.assertImagesAlmostEqual(batched, self.surf)
+
     def test_fill_gradient(self):
         """We can fill the screen with a gradient."""
         self.screen.fill('black', gcolor='blue')
@@ -231,6 +252,79 @@ class ScreenTest(unittest.TestCase):
         )
         assert_screen_match(self.surf, 'wrapped_gradient_text')
 
+    def test_dirty_rects_disabled(self):
+        """Without dirty rect tracking, the whole display is updated."""
+        self.screen.blit('alien', (0, 0))
+        self.assertIsNone(self.screen._take_dirty_rects())
+
+    def test_dirty_rects_first_fill(self):
+        """The first fill of the screen requires a full display update."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.assertIsNone(self.screen._take_dirty_rects())
+
+    def test_dirty_rects_blit(self):
+        """Blits and drawing operations are recorded as dirty rects."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.screen._take_dirty_rects()
+
+        self.screen.blit('alien', (10, 10))
+        self.screen.draw.filled_rect(Rect(150, 150, 10, 10), 'red')
+        self.assertEqual(
+            sorted(self.screen._take_dirty_rects()),
+            [Rect(10, 10, 66, 92), Rect(150, 150, 10, 10)]
+        )
+
+    def test_dirty_rects_clear(self):
+        """Clearing the screen dirties the areas drawn on the last frame."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.screen.blit('alien', (10, 10))
+        self.screen._take_dirty_rects()
+
+        self.screen.clear()
+        self.screen.blit('alien', (20, 10))
+        self.assertEqual(
+            self.screen._take_dirty_rects(),
+            [Rect(10, 10, 76, 92)]
+        )
+
+    def test_dirty_rects_new_background(self):
+        """Filling with a different colour requires a full update."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.screen._take_dirty_rects()
+
+        self.screen.fill('red')
+        self.assertIsNone(self.screen._take_dirty_rects())
+
+    def test_dirty_rects_many(self):
+        """With very many dirty rects, the whole display is updated."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.screen._take_dirty_rects()
+
+        n = self.screen.MAX_DIRTY_RECTS + 1
+        for i in range(n):
+            self.screen.draw.filled_rect(Rect(i % 100, 0, 1, 1), 'red')
+        self.assertIsNone(self.screen._take_dirty_rects())
+        self.assertEqual(self.screen._content, [self.screen.bounds()])
+
+        # Clearing the screen then updates the whole display
+        self.screen.clear()
+        self.assertIsNone(self.screen._take_dirty_rects())
+
+    def test_dirty_rects_large_area(self):
+        """If most of the screen is dirty, the whole display is updated."""
+        self.screen._set_dirty_tracking(True)
+        self.screen.clear()
+        self.screen._take_dirty_rects()
+
+        w, h = self.screen.width, self.screen.height
+        self.screen.draw.filled_rect(Rect(0, 0, w, h * 0.6), 'red')
+        self.assertIsNone(self.screen._take_dirty_rects())
+
     def test_bounds(self):
         """We can get a bounding rect for the screen."""
         self.assertEqual(
@@ -0,0 +1,142 @@
+import unittest
+from itertools import islice
+from types import SimpleNamespace
+from unittest import mock
+
+import pgzero.game
+from pgzero.game import FixedTimestep, PGZeroGame, frames
+
+
+class FixedTimestepTest(unittest.TestCase):
+    def test_whole_steps(self):
+        """A frame time of several steps runs that many steps."""
+        ts = FixedTimestep(100)
+        steps, alpha = ts.advance(0.03)
+        self.assertEqual(steps, 3)
+        self.assertAlmostEqual(alpha, 0.0)
+
+    def test_carry_over(self):
+        """Partial steps are carried over to the next frame."""
+        ts = FixedTimestep(100)
+        self.assertEqual(ts.advance(0.004)[0], 0)
+        steps, alpha = ts.advance(0.0075)
+        self.assertEqual(steps, 1)
+        self.assertAlmostEqual(alpha, 0.15)
+
+    def test_max_steps(self):
+        """Long frames run at most max_steps steps."""
+        ts = FixedTimestep(100, max_steps=5)
+        steps, alpha = ts.advance(1.0025)
+        self.assertEqual(steps, 5)
+        self.assertAlmostEqual(alpha, 0.25)
+        self.assertEqual(ts.advance(0.0)[0], 0)
+
+    def test_invalid_rate(self):
+        """The update rate must be positive."""
+        with self.assertRaises(ValueError):
+            FixedTimestep(0)
+
+
+class DrawAlphaTest(unittest.TestCase):
+    def test_draw_alpha(self):
+        """draw(alpha) is passed the interpolation fraction."""
+        alphas = []
+
+        def draw(alpha):
+            alphas.append(alpha)
+
+        game = PGZeroGame(SimpleNamespace(draw=draw))
+        draw_func = game.get_draw_func()
+        game.alpha = 0.5
+        draw_func()
+        self.assertEqual(alphas, [0.5])
+
+    def test_draw_too_many_args(self):
+        """draw() may take at most one argument."""
+        game = PGZeroGame(SimpleNamespace(draw=lambda a, b: None))
+        with self.assertRaises(TypeError):
+            game.get_draw_func()
+
+
+class FakeTime:
+    """A stand-in for perf_counter() and sleep() in pgzero.game.
+
+    Each reading of the time advances it by `tick`, so busy-waits finish.
+
+    """
+
+    def __init__(self, tick=0.0001):
+        self.now = 100.0
+        self.tick = tick
+        self.sleeps = []
+
+    def perf_counter(self):
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FramesTest(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        for name in ('perf_counter', 'sleep'):
+            patcher = mock.patch.object(pgzero.game, name, getattr(self.time, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_wait_until(self):
+        """wait_until() sleeps until SPIN_TIME before the deadline."""
+        deadline = self.time.now + 0.01
+        pgzero.game.wait_until(deadline)
+        self.assertEqual(len(self.time.sleeps), 1)
+        self.assertAlmostEqual(
+            self.time.sleeps[0], 0.01 - pgzero.game.SPIN_TIME, delta=0.001
+        )
+        self.assertGreaterEqual(self.time.now, deadline)
+        self.assertLess(self.time.now, deadline + 0.001)
+
+    def test_wait_until_spin(self):
+        """wait_until() doesn't sleep when the deadline is close."""
+        pgzero.game.wait_until(self.time.now + pgzero.game.SPIN_TIME / 2)
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_frame_rate(self):
+        """frames() paces frames at the given rate."""
+        start = self.time.now
+        dts = list(islice(frames(200), 11))
+        self.assertAlmostEqual(self.time.now - start, 0.05, delta=0.001)
+        for dt in dts:
+            self.assertAlmostEqual(dt, 0.005, delta=0.001)
+
+    def test_fallen_behind(self):
+        """After a slow frame, frames() doesn't try to catch up."""
+        it = frames(100)
+        next(it)
+        self.time.now += 0.05
+        self.assertAlmostEqual(next(it), 0.05, delta=0.001)
+        self.time.sleeps.clear()
+        self.assertAlmostEqual(next(it), 0.01, delta=0.001)
+        self.assertEqual(len(self.time.sleeps), 1)
+
+    def test_uncapped(self):
+        """frames(0) doesn't wait between frames."""
+        list(islice(frames(0), 100))
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_max_fps_default(self):
+        """Games run at 60 FPS by default."""
+        game = PGZeroGame(SimpleNamespace())
+        self.assertEqual(game.get_max_fps(), 60)
+
+    def test_max_fps_module(self):
+        """The FPS constant sets the frame rate."""
+        game = PGZeroGame(SimpleNamespace(FPS=144))
+        self.assertEqual(game.get_max_fps(), 144)
+
+    def test_max_fps_override(self):
+        """The max_fps argument overrides the FPS constant."""
+        game = PGZeroGame(SimpleNamespace(FPS=144), max_fps=0)
+        self.assertEqual(game.get_max_fps(), 0)